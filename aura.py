@@ -1,8 +1,8 @@
 """Manages auras / ongoing effects during game"""
 
-from character.character_class import Character
+from character.character_class import Character, EffectState
 from character.character_effect_types import CharacterEffectType
-from character.character_effects import CharacterAbility
+from game_log import LogEvent, LogLevel
 from target.target_get import get_available_targets
 
 
@@ -10,13 +10,16 @@ from target.target_get import get_available_targets
 
 class Aura:
 	def __init__(self):
-		self.aura_sources: list[tuple[Character, CharacterAbility]] = []
+		# Sources with the effect state of their aura ability, which identifies the aura on targets
+		self.aura_sources: list[tuple[Character, EffectState]] = []
 
-	def create_aura_source(self, source: Character, ability: CharacterAbility):
+	def create_aura_source(self, source: Character, effect_state: EffectState):
+		ability = effect_state.effect
 		if ability.effect_type != CharacterEffectType.aura:
 			return
 
-		self.aura_sources.append((source, ability))
+		self.record_change(source)
+		self.aura_sources.append((source, effect_state))
 
 		# Run apply effect on active targets
 		targets = get_available_targets(ability.query_target, source.commander.game, source)
@@ -27,32 +30,52 @@ class Aura:
 		for effect in self.aura_sources:
 			if effect[0] == source:
 				# Run silence effect on remaining targets
-				targets = get_available_targets(effect[1].query_target, source.commander.game, source)
-				effect[1].silence_effect_function(targets)
+				targets = get_available_targets(effect[1].effect.query_target, source.commander.game, source)
+				effect[1].effect.silence_effect_function(targets)
 				continue
 
 			# Append remaining effect
 			new_aura_effects.append(effect)
 
+		self.record_change(source)
 		self.aura_sources = new_aura_effects
 
+	# State functions
+
+	def record_change(self, source: Character):
+		# Report a change before it happens, when the game tracks changes
+		if source.commander.game.is_tracking_changes:
+			source.commander.game.record_change(self)
+
+	def get_state(self):
+		return tuple(self.aura_sources)
+
+	def set_state(self, state: tuple):
+		self.aura_sources = list(state)
+
 	def apply_aura_effects(self, target: Character):
+		cost_accounting = target.commander.game.cost_accounting
 		for effect in self.aura_sources:
-			try:
-				effect[1].query_target.check_character_valid(effect[0], target)
-			except Exception:
-				continue
+			# Charge cost to the aura source's card
+			if cost_accounting is not None:
+				with cost_accounting.measure(effect[0].name, "aura"):
+					self.__apply_aura_effect(effect, target)
+			else:
+				self.__apply_aura_effect(effect, target)
 
-			if target.has_active_aura_effect(effect[1]):
-				continue
-			target.apply_aura_effect(effect[1])
+	def __apply_aura_effect(self, effect: tuple[Character, EffectState], target: Character):
+		try:
+			effect[1].effect.query_target.check_character_valid(effect[0], target)
+		except Exception:
+			return
 
-			# Save logs
-			target.commander.game.save_log(
-				f"<{target.commander.name}>'s"
-				f" character [{target.name}]"
-				f" gained aura effect from [{effect[0].name}]."
-			)
+		if target.has_active_aura_effect(effect[1]):
+			return
+		target.apply_aura_effect(effect[1])
+
+		# Save logs
+		if target.commander.game.log_level >= LogLevel.full:
+			target.commander.game.save_log(LogEvent.aura_gained, target.commander.name, target.entity_id, effect[0].entity_id)
 
 	def remove_aura_effects(self, target: Character):
 		for effect in self.aura_sources:
@@ -61,8 +84,5 @@ class Aura:
 			target.remove_aura_effect(effect[1])
 
 			# Save logs
-			target.commander.game.save_log(
-				f"<{target.commander.name}>'s"
-				f" character [{target.name}]"
-				f" lost aura effect from [{effect[0].name}]."
-			)
\ No newline at end of file
+			if target.commander.game.log_level >= LogLevel.full:
+				target.commander.game.save_log(LogEvent.aura_lost, target.commander.name, target.entity_id, effect[0].entity_id)
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""Macro-benchmarks for full headless games"""
+
+import time
+
+from benchmarks.bench_utils import BenchmarkResult
+from game_loop import default_deck_cards
+from simulation import create_bot_game, get_card_names, play_bot_game
+
+# Functions
+
+def run_game_benchmark(game_count=200, player_count=2, seed=0) -> BenchmarkResult:
+	deck_card_names = get_card_names(default_deck_cards)
+
+	# Play seeded bot games one after another
+	total_rounds = 0
+	start_time = time.perf_counter()
+	for game_index in range(game_count):
+		game = play_bot_game(create_bot_game(deck_card_names, player_count, seed + game_index))
+		total_rounds += game.round_number
+	elapsed_time = time.perf_counter() - start_time
+
+	return {
+		"games": game_count,
+		"players": player_count,
+		"elapsed_s": elapsed_time,
+		"games_per_second": game_count / elapsed_time,
+		"mean_game_ms": elapsed_time / game_count * 1e3,
+		"mean_rounds": total_rounds / game_count,
+	}
+
+def run_macro_benchmarks(game_count=200) -> dict[str, BenchmarkResult]:
+	return {
+		"default_deck_1v1": run_game_benchmark(game_count),
+	}
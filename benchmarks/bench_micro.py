@@ -0,0 +1,40 @@
+"""Micro-benchmarks for engine hot paths"""
+
+from benchmarks.bench_utils import BenchmarkResult, create_started_game, fill_battlefield, time_function, \
+	time_with_setup
+from cards.card_storage import minion_cards
+from game_controller import attack_query_target
+from game_loop import default_deck_cards
+from player_client.deck import Deck
+from target.target_get import get_available_targets
+
+# Functions
+
+def run_micro_benchmarks() -> dict[str, BenchmarkResult]:
+	# Two full battlefields with an aura, taunt and stealth in play
+	game = create_started_game()
+	player, enemy = game.players
+	fill_battlefield(player, minion_cards["Stormwind Champion"], 1)
+	fill_battlefield(player, minion_cards["Chillwind Yeti"], 6)
+	fill_battlefield(enemy, minion_cards["Booty Bay Bodyguard"], 1)
+	fill_battlefield(enemy, minion_cards["Spymistress"], 1)
+	fill_battlefield(enemy, minion_cards["Bloodfen Raptor"], 5)
+	attacker = player.battlefield.characters[1]
+	target = enemy.battlefield.characters[0]
+
+	return {
+		"get_available_targets": time_function(
+			lambda: get_available_targets(attack_query_target, game, attacker)
+		),
+		"check_character_valid": time_function(
+			lambda: attack_query_target.check_character_valid(attacker, target), number=10000
+		),
+		"apply_effects": time_function(lambda: attacker.apply_effects(), number=10000),
+		"apply_aura_effects": time_function(lambda: game.aura.apply_aura_effects(attacker), number=10000),
+		"resolve_deaths": time_function(lambda: game.resolve_deaths(), number=10000),
+		"deck_draw_card": time_with_setup(
+			lambda deck: deck.draw_card(),
+			lambda: Deck(default_deck_cards),
+			number=1000,
+		),
+	}
@@ -0,0 +1,68 @@
+"""Scaling benchmarks over board fullness, auras and player count"""
+
+from benchmarks.bench_macro import run_game_benchmark
+from benchmarks.bench_utils import BenchmarkResult, create_started_game, fill_battlefield, time_function
+from cards.card_storage import minion_cards
+from game_controller import attack_query_target
+from target.target_get import get_available_targets
+
+# Functions
+
+def apply_all_effects(game):
+	for player in game.players:
+		for character in player.battlefield.characters:
+			character.apply_effects()
+
+def run_board_scaling() -> list[BenchmarkResult]:
+	results = []
+	for minion_count in range(8):
+		# Fill both battlefields
+		game = create_started_game()
+		player, enemy = game.players
+		fill_battlefield(player, minion_cards["Chillwind Yeti"], minion_count)
+		fill_battlefield(enemy, minion_cards["Booty Bay Bodyguard"], minion_count)
+
+		results.append({
+			"minions_per_player": minion_count,
+			"get_available_targets_us": time_function(
+				lambda: get_available_targets(attack_query_target, game, player.hero)
+			)["best_us"],
+			"resolve_deaths_us": time_function(lambda: game.resolve_deaths(), number=10000)["best_us"],
+			"apply_all_effects_us": time_function(lambda: apply_all_effects(game))["best_us"],
+		})
+	return results
+
+def run_aura_scaling() -> list[BenchmarkResult]:
+	results = []
+	for champion_count in range(7):
+		# One yeti surrounded by Stormwind Champions
+		game = create_started_game()
+		player = game.players[0]
+		fill_battlefield(player, minion_cards["Chillwind Yeti"], 1)
+		fill_battlefield(player, minion_cards["Stormwind Champion"], champion_count)
+		yeti = player.battlefield.characters[0]
+
+		results.append({
+			"stormwind_champions": champion_count,
+			"apply_effects_us": time_function(lambda: yeti.apply_effects(), number=10000)["best_us"],
+			"apply_all_effects_us": time_function(lambda: apply_all_effects(game))["best_us"],
+		})
+	return results
+
+def run_player_scaling(game_count=50) -> list[BenchmarkResult]:
+	results = []
+	for player_count in range(2, 7):
+		game = create_started_game(player_count)
+		result = run_game_benchmark(game_count, player_count)
+		result["get_available_targets_us"] = time_function(
+			lambda: get_available_targets(attack_query_target, game, game.turn_get_player().hero)
+		)["best_us"]
+		results.append(result)
+	return results
+
+def run_scaling_benchmarks(game_count=50) -> dict[str, list[BenchmarkResult]]:
+	return {
+		"board_fullness": run_board_scaling(),
+		"stormwind_champions": run_aura_scaling(),
+		"player_count": run_player_scaling(game_count),
+	}
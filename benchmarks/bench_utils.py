@@ -0,0 +1,71 @@
+"""Contains helpers for timing engine benchmarks"""
+
+import timeit
+import typing
+
+from cards.card_base import create_card_instance
+from cards.card_minion import MinionCard
+from character.character_class import CharacterType
+from game_controller import GameController
+from player_client.player import Player
+from simulation import create_bot_game, get_card_names
+from game_loop import default_deck_cards
+
+# Types
+
+type BenchmarkResult = dict[str, float | int]
+
+# Timing functions
+
+def time_function(function: typing.Callable[[], typing.Any], number=1000, repeat=5) -> BenchmarkResult:
+	# Take the best of several runs to reduce noise
+	times = timeit.Timer(function).repeat(repeat, number)
+	return {
+		"number": number,
+		"repeat": repeat,
+		"best_us": min(times) / number * 1e6,
+		"mean_us": sum(times) / len(times) / number * 1e6,
+	}
+
+def time_with_setup(
+		function: typing.Callable[[typing.Any], typing.Any],
+		setup: typing.Callable[[], typing.Any],
+		number=100,
+		repeat=5,
+) -> BenchmarkResult:
+	# Run a fresh setup before each call, timing only the call
+	times = []
+	for _ in range(repeat):
+		total_time = 0
+		for _ in range(number):
+			argument = setup()
+			start_time = timeit.default_timer()
+			function(argument)
+			total_time += timeit.default_timer() - start_time
+		times.append(total_time)
+	return {
+		"number": number,
+		"repeat": repeat,
+		"best_us": min(times) / number * 1e6,
+		"mean_us": sum(times) / len(times) / number * 1e6,
+	}
+
+# Game setup functions
+
+def create_started_game(player_count=2, seed=0) -> GameController:
+	game = create_bot_game(get_card_names(default_deck_cards), player_count, seed)
+	game.start_game()
+	game.begin_turn()
+	return game
+
+def fill_battlefield(player: Player, minion: MinionCard, count: int):
+	# Summon minions on the first empty positions
+	characters = player.battlefield.characters
+	for position in range(len(characters)):
+		if count <= 0:
+			break
+		if characters[position].character_type == CharacterType.none:
+			# Instance numbers past the deck's, so entity ids don't clash with drawn cards
+			card_instance = create_card_instance(minion, len(player.deck.cards) + position)
+			player.battlefield.add_minion_at(minion, position, player.get_entity_id(card_instance))
+			count -= 1
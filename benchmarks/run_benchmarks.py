@@ -0,0 +1,40 @@
+"""Runs the benchmark suite and outputs the results as JSON
+
+Usage (from the project root): python -m benchmarks.run_benchmarks [output.json] [--quick]
+"""
+
+import json
+import platform
+import sys
+import time
+
+from benchmarks.bench_macro import run_macro_benchmarks
+from benchmarks.bench_micro import run_micro_benchmarks
+from benchmarks.bench_scaling import run_scaling_benchmarks
+
+# Functions
+
+def run_benchmarks(is_quick=False):
+	game_count = 20 if is_quick else 200
+	return {
+		"python": platform.python_version(),
+		"platform": platform.platform(),
+		"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+		"micro": run_micro_benchmarks(),
+		"macro": run_macro_benchmarks(game_count),
+		"scaling": run_scaling_benchmarks(game_count // 4),
+	}
+
+def main():
+	arguments = [argument for argument in sys.argv[1:] if argument != "--quick"]
+	results = run_benchmarks("--quick" in sys.argv)
+
+	# Output JSON
+	results_json = json.dumps(results, indent=2)
+	if arguments:
+		with open(arguments[0], "w") as file:
+			file.write(results_json)
+	print(results_json)
+
+if __name__ == "__main__":
+	main()
@@ -1,13 +1,65 @@
 """Contains the base class for player cards"""
 
+# Types
+
+# Card id in the low bits, instance number (unique within a deck) in the high bits
+type CardInstance = int
+
+# Variables
+
+registered_cards: dict[str, "Card"] = {}
+
+# Cards by their registry id, which starts at 1 so 0 means no card
+cards_by_id: list["Card | None"] = [None]
+
+card_id_bits = 16
+card_id_mask = (1 << card_id_bits) - 1
+
+# Registry functions
+
+def register_card(card: "Card"):
+	card.card_id = len(cards_by_id)
+	registered_cards[card.name] = card
+	cards_by_id.append(card)
+
+def get_registered_card(name: str):
+	return registered_cards[name]
+
+def get_card_by_id(card_id: int):
+	return cards_by_id[card_id]
+
+# Card instance functions
+
+def create_card_instance(card: "Card", instance_number: int) -> CardInstance:
+	return (instance_number << card_id_bits) | card.card_id
+
+def get_instance_card_id(card_instance: CardInstance):
+	return card_instance & card_id_mask
+
+def get_instance_card(card_instance: CardInstance) -> "Card":
+	return cards_by_id[card_instance & card_id_mask]
+
+# Card class
+
 class Card:
+	__slots__ = ("name", "mana_cost", "description", "card_id")
+
 	def __init__(self, name: str, mana_cost: int, description: str):
 		self.name = name
 		self.mana_cost = mana_cost
 		self.description = description
 
+		# Set when registered
+		self.card_id = 0
+
 	def play(self, *args, **kwargs):
 		pass
 
+	def __reduce_ex__(self, protocol):
+		# Registered cards are shared definitions, so pickle / copy them by name
+		if registered_cards.get(self.name) is self:
+			return get_registered_card, (self.name,)
+		return super().__reduce_ex__(protocol)
+
 	def __str__(self):
 		return f"{self.name:>20} | Mana cost: {self.mana_cost:<2} | {self.description}"
@@ -10,6 +10,8 @@ if TYPE_CHECKING:
 # Minion card class
 
 class MinionCard(Card):
+	__slots__ = ("attack", "health", "card_effects")
+
 	def __init__(
 			self,
 			name: str,
@@ -22,7 +24,7 @@ class MinionCard(Card):
 		super().__init__(name, mana_cost, description)
 		self.attack = attack
 		self.health = health
-		self.card_effects = card_effects
+		self.card_effects = tuple(card_effects)
 
 	def play(self):
 		pass
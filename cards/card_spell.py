@@ -12,6 +12,8 @@ if TYPE_CHECKING:
 # Spell card class
 
 class SpellCard(Card):
+	__slots__ = ("spells",)
+
 	def __init__(
 			self,
 			name: str,
@@ -20,21 +22,22 @@ class SpellCard(Card):
 			spells: list["Spell"],
 	):
 		super().__init__(name, mana_cost, description)
-		self.spells = spells
+		self.spells = tuple(spells)
 
 	def get_targets_list(self, game: "GameController"):
-		# Go through & get each spell's targets
+		# Go through & get each user input spell's targets
 		targets_list = []
 		for spell in self.spells:
+			# Random / all targets are resolved once, when the spell is played
+			if spell.query_target.choose_method != TargetChooseMethod.user_input:
+				targets_list.append([])
+				continue
+
 			while True:
 				print()
 				print(f"Current spell: *** {spell} ***")
 				targets = spell.input_targets(game)
 
-				# Break directly is targets are random
-				if spell.query_target.choose_method == TargetChooseMethod.random:
-					break
-
 				# Targets confirmation
 				print(f"{" Target Decision ":-^30}")
 				print(f"Targets: {", ".join(target.name for target in targets)}")
@@ -62,7 +65,37 @@ class SpellCard(Card):
 		# Return targets for each spell
 		return targets_list
 
-	def play(self, targets_list: list[TargetsType]):
+	def resolve_targets_list(self, game: "GameController", chosen_targets_list: list[TargetsType]):
+		# Go through & resolve each spell's targets without user input
+		targets_list = []
+		for spell_index in range(len(self.spells)):
+			spell = self.spells[spell_index]
+
+			# Use chosen targets for user input spells
+			if spell.query_target.choose_method == TargetChooseMethod.user_input:
+				targets = []
+				if spell_index < len(chosen_targets_list):
+					targets = chosen_targets_list[spell_index]
+				if not spell.check_targets_valid(game, targets):
+					return []
+
+			# Get random / all targets
+			else:
+				targets = spell.input_targets(game)
+
+			if not spell.can_cast_spell(targets):
+				return []
+			targets_list.append(targets)
+
+		# Return targets for each spell
+		return targets_list
+
+	def play(self, targets_list: list[TargetsType], game: "GameController"):
 		# Play spells
 		for spell, targets in zip(self.spells, targets_list):
-			spell.spell_effect(targets)
+			# Charge cost to this card
+			if game.cost_accounting is not None:
+				with game.cost_accounting.measure(self.name, "spell effect"):
+					spell.spell_effect(targets)
+			else:
+				spell.spell_effect(targets)
@@ -1,5 +1,8 @@
 """Defines all cards (minion, spell)"""
 
+from types import MappingProxyType
+
+from cards.card_base import register_card
 from cards.card_minion import MinionCard
 from cards.card_spell import SpellCard
 from character.character_effect_examples import create_taunt_ability, create_charge_ability, create_stealth_ability
@@ -13,7 +16,7 @@ from spells.spell_module import Spell
 
 # Variables
 
-minion_cards = {
+minion_cards = MappingProxyType({
 	"Chillwind Yeti": MinionCard(
 		"Chillwind Yeti", 4,
 		"A classic yeti minion with solid stats.",
@@ -86,12 +89,12 @@ minion_cards = {
 			create_stealth_ability()
 		]
 	),
-}
+})
 
 upcoming_minion_cards = {
 }
 
-spell_cards = {
+spell_cards = MappingProxyType({
 	"Fireball": SpellCard(
 		"Fireball", 4,
 		"Deal 6 damage.",
@@ -210,4 +213,9 @@ spell_cards = {
 			)
 		]
 	),
-}
+})
+
+# Register cards
+
+for card in (minion_cards | spell_cards).values():
+	register_card(card)
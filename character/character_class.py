@@ -1,11 +1,11 @@
 """Contains the character class which represents heroes and minions on the battlefield"""
 
-import typing
-from copy import deepcopy
 from typing import TYPE_CHECKING
 from enum import Enum
 
-from character.character_effect_types import CharacterEffectType
+from cards.card_base import card_id_mask
+from character.character_effect_types import CharacterKeyword
+from game_log import EntityId, LogEvent, LogLevel
 
 if TYPE_CHECKING:
 	from cards.card_minion import MinionCard
@@ -19,13 +19,36 @@ class CharacterType(Enum):
 	minion = "minion",
 	hero = "hero",
 
-# Types
+# Variables
 
-EffectState = typing.TypedDict("EffectState", {"effect": "CharacterAbility", "state": bool})
+# Shared by characters without aura effects (frozenset() isn't a singleton)
+empty_effects = frozenset()
+
+# Keyword bits as plain ints, so bit tests don't go through IntFlag operators
+taunt_keyword = int(CharacterKeyword.taunt)
+stealth_keyword = int(CharacterKeyword.stealth)
+
+# Effect state class
+
+class EffectState:
+	# Abilities are shared definitions, so each summon only allocates this small state record
+	__slots__ = ("effect", "is_active", "is_enabled", "is_silenced")
+
+	def __init__(self, effect: "CharacterAbility"):
+		self.effect = effect
+		self.is_active = True
+		self.is_enabled = False
+		self.is_silenced = False
 
 # Character class
 
 class Character:
+	__slots__ = (
+		"character_type", "commander", "name", "description", "max_health", "health", "attack",
+		"defense", "moves_left", "source_card", "entity_id", "effect_states", "active_keywords",
+		"active_aura_effects",
+	)
+
 	def __init__(self, player: "Player"):
 		self.character_type = CharacterType.none
 		self.commander = player
@@ -37,11 +60,21 @@ class Character:
 		self.defense = 0
 		self.moves_left = 0
 		self.source_card = None
+		self.entity_id: EntityId = None
 		self.effect_states: list[EffectState] = list()
-		self.active_effect_types: set["CharacterEffectType"] = set()
-		self.active_aura_effects: set["CharacterAbility"] = set()
 
-	def set_as_minion(self, minion: "MinionCard"):
+		# Bit mask of CharacterKeyword flags
+		self.active_keywords = 0
+
+		# Frozen set, so characters without aura effects share the empty set and states share it uncopied
+		self.active_aura_effects: frozenset[EffectState] = empty_effects
+
+	def set_as_minion(self, minion: "MinionCard", entity_id: EntityId = None):
+		self.record_change()
+
+		# Clear the previous minion's effects while it still has its name
+		self.clear_effect_states()
+
 		self.character_type = CharacterType.minion
 		self.name = minion.name
 		self.description = minion.description
@@ -52,12 +85,18 @@ class Character:
 		self.moves_left = 0
 		self.source_card = minion
 
-		self.clear_effect_states()
-		self.add_multiple_effects(deepcopy(minion.card_effects))
+		# Transformed minions keep their instance number, under the new card's id
+		if entity_id is None:
+			entity_id = (self.entity_id & ~card_id_mask) | minion.card_id
+		self.entity_id = entity_id
+
+		self.add_multiple_effects(minion.card_effects)
 
 	def set_as_hero(self, health: int):
+		self.record_change()
 		self.character_type = CharacterType.hero
 		self.name = self.commander.name
+		self.entity_id = self.commander.name
 		self.description = "A hero"
 		self.max_health = health
 		self.health = health
@@ -72,6 +111,7 @@ class Character:
 	# Turn functions
 
 	def reset_moves(self):
+		self.record_change()
 		if self.character_type == CharacterType.minion:
 			self.moves_left = 1
 		else:
@@ -80,11 +120,13 @@ class Character:
 	# Attack stat functions
 
 	def change_attack(self, change_by: int):
+		self.record_change()
 		self.attack += change_by
 
 	# Health functions
 
 	def change_max_health(self, change_by: int):
+		self.record_change()
 		self.max_health += change_by
 		if change_by > 0:
 			# Increment current health by same amount
@@ -95,33 +137,33 @@ class Character:
 
 	def restore_health(self, restore_by: int):
 		assert restore_by >= 0
+		self.record_change()
 
 		# Restore health, capping at maximum health
 		self.health += restore_by
 		self.health = min(self.max_health, self.health)
 
 		# Save logs
-		self.commander.game.save_log(
-			f"<{self.commander.name}>'s"
-			f" character [{self.name}]"
-			f" restored to {self.health} health."
-		)
+		if self.commander.game.log_level >= LogLevel.full:
+			self.commander.game.save_log(
+				LogEvent.heal, self.commander.name, self.entity_id, self.health, self.commander.game.log_source
+			)
 
 	def receive_damage(self, damage: int):
 		assert damage >= 0
+		self.record_change()
 
 		# Reduce health
 		self.health -= damage
 
 		# Save logs
-		self.commander.game.save_log(
-			f"<{self.commander.name}>'s"
-			f" character [{self.name}]"
-			f" received {damage} damage,"
-			f" {self.health} health remaining."
-		)
+		if self.commander.game.log_level >= LogLevel.full:
+			self.commander.game.save_log(
+				LogEvent.damage, self.commander.name, self.entity_id, damage, self.health, self.commander.game.log_source
+			)
 
 	def set_health(self, health: int):
+		self.record_change()
 		self.health = health
 
 	def destroy(self):
@@ -130,8 +172,9 @@ class Character:
 	# Effect functions
 
 	def clear_effect_states(self):
+		self.record_change()
 		self.remove_all_effects()
-		self.active_effect_types.clear()
+		self.set_active_keywords(0)
 		self.effect_states.clear()
 
 	def add_multiple_effects(self, effects: list["CharacterAbility"]):
@@ -140,83 +183,107 @@ class Character:
 		self.apply_effects()
 
 	def add_effect(self, effect: "CharacterAbility", refresh=True):
+		self.record_change()
+
 		# Append enabled effect
-		self.effect_states.append({"effect": effect, "state": True})
+		self.effect_states.append(EffectState(effect))
 
 		if refresh:
 			self.apply_effects()
 
 	def remove_all_effects(self):
+		self.record_change()
 		for effect_state in self.effect_states:
-			if not effect_state["state"]:
+			if not effect_state.is_active:
 				continue
 
 			# Disable the effect
-			effect_state["state"] = False
+			effect_state.is_active = False
 
 		self.apply_effects()
 
 	def remove_effect(self, effect: "CharacterAbility"):
+		self.record_change()
 		for effect_state in self.effect_states:
-			if effect_state["effect"] != effect:
+			if effect_state.effect != effect:
 				continue
-			if not effect_state["state"]:
+			if not effect_state.is_active:
 				continue
 
 			# Disable the effect
-			effect_state["state"] = False
+			effect_state.is_active = False
 
 		self.apply_effects()
 
 	def apply_effects(self):
+		self.record_change()
+
+		# Count call
+		if self.commander.game.instrumentation is not None:
+			self.commander.game.instrumentation.count("apply_effects")
+
 		# Own effects
 		for effect_state in self.effect_states:
-			effect = effect_state["effect"]
-			if effect_state["state"]:
-				effect.apply(self, self.commander.game)
+			if effect_state.is_active:
+				effect_state.effect.apply(self, self.commander.game, effect_state)
 			else:
-				effect.silence(self, self.commander.game)
+				effect_state.effect.silence(self, self.commander.game, effect_state)
 
 		# Aura effects
 		self.commander.game.aura.apply_aura_effects(self)
 
+	# Keyword functions
+
+	def set_active_keywords(self, active_keywords: int):
+		self.record_change()
+		self.active_keywords = active_keywords
+		self.commander.battlefield.clear_keyword_mask()
+
+	def get_visible_keywords(self):
+		if self.character_type == CharacterType.none:
+			return 0
+
+		# Stealth hides taunt
+		if self.active_keywords & stealth_keyword:
+			return self.active_keywords & ~taunt_keyword
+		return self.active_keywords
+
 	def has_active_taunt(self):
 		if self.character_type == CharacterType.none:
 			return False
-		if CharacterEffectType.stealth in self.active_effect_types:
-			return False
-		return CharacterEffectType.taunt in self.active_effect_types
+		return self.active_keywords & (taunt_keyword | stealth_keyword) == taunt_keyword
 
 	# Aura effect
 
-	def has_active_aura_effect(self, aura_effect: "CharacterAbility"):
+	# Aura effects are keyed by the source's effect state, since abilities are shared between summons
+
+	def has_active_aura_effect(self, aura_effect: EffectState):
 		return aura_effect in self.active_aura_effects
 
-	def apply_aura_effect(self, aura_effect: "CharacterAbility"):
+	def apply_aura_effect(self, aura_effect: EffectState):
 		if aura_effect in self.active_aura_effects:
 			return
 
+		self.record_change()
 		self.active_aura_effects |= {aura_effect}
-		aura_effect.apply_effect_function([self])
+		aura_effect.effect.apply_effect_function([self])
 
-	def remove_aura_effect(self, aura_effect: "CharacterAbility"):
+	def remove_aura_effect(self, aura_effect: EffectState):
 		if not aura_effect in self.active_aura_effects:
 			return
 
+		self.record_change()
 		self.active_aura_effects -= {aura_effect}
-		aura_effect.silence_effect_function([self])
+		aura_effect.effect.silence_effect_function([self])
 
 	# Event functions
 
 	def on_attack(self):
 		# Remove stealth
-		if CharacterEffectType.stealth in self.active_effect_types:
-			self.active_effect_types -= {CharacterEffectType.stealth}
-			self.commander.game.save_log(
-				f"<{self.commander.name}>'s"
-				f" character [{self.name}]"
-				f" lost stealth."
-			)
+		if self.active_keywords & stealth_keyword:
+			self.set_active_keywords(self.active_keywords & ~stealth_keyword)
+			if self.commander.game.log_level >= LogLevel.full:
+				self.commander.game.save_log(LogEvent.lose_stealth, self.commander.name, self.entity_id)
 
 	def on_destruction(self):
 		assert self.health <= 0
@@ -225,31 +292,67 @@ class Character:
 			return
 
 		# Print character death
-		print(f"(DEATH) <{self.commander.name}>'s [{self.name}] was destroyed!")
+		if self.commander.game.output.is_enabled:
+			self.commander.game.output.write(f"(DEATH) <{self.commander.name}>'s [{self.name}] was destroyed!")
 
 		# Save logs
-		self.commander.game.save_log(
-			f"<{self.commander.name}>'s"
-			f" character [{self.name}]"
-			f" was destroyed."
-		)
+		if self.commander.game.log_level >= LogLevel.game:
+			self.commander.game.save_log(LogEvent.destroyed, self.commander.name, self.entity_id)
 
 		# Remove active effects
 
 		self.clear_effect_states()
 
+		self.record_change()
 		self.character_type = CharacterType.none
+		self.commander.battlefield.clear_keyword_mask()
 
 		# TODO: Death effects
 		pass
 
+	# State functions
+
+	def record_change(self):
+		# Report a change before it happens, when the game tracks changes
+		game = self.commander.game
+		if game is not None and game.is_tracking_changes:
+			game.record_change(self)
+
+	def get_state(self):
+		return (
+			self.character_type, self.name, self.description,
+			self.max_health, self.health, self.attack, self.defense, self.moves_left,
+			self.source_card, self.entity_id,
+			tuple(
+				(effect_state, effect_state.is_active, effect_state.is_enabled, effect_state.is_silenced)
+				for effect_state in self.effect_states
+			),
+			self.active_keywords,
+			self.active_aura_effects,
+		)
+
+	def set_state(self, state: tuple):
+		(
+			self.character_type, self.name, self.description,
+			self.max_health, self.health, self.attack, self.defense, self.moves_left,
+			self.source_card, self.entity_id,
+			effect_states, self.active_keywords, active_aura_effects,
+		) = state
+		# Effect state records keep their identity, since aura effects are keyed by them
+		self.effect_states = []
+		for effect_state, is_active, is_enabled, is_silenced in effect_states:
+			effect_state.is_active, effect_state.is_enabled, effect_state.is_silenced = is_active, is_enabled, is_silenced
+			self.effect_states.append(effect_state)
+		self.active_aura_effects = active_aura_effects
+		self.commander.battlefield.clear_keyword_mask()
+
 	# Display functions
 
 	def get_state_display(self):
 		result_str = ""
 		if self.moves_left <= 0:
 			result_str += "-Zzz- "
-		if CharacterEffectType.stealth in self.active_effect_types:
+		if self.active_keywords & stealth_keyword:
 			result_str += "-STEALTH- "
 		elif self.has_active_taunt():
 			result_str += "-TAUNT- "
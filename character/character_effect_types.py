@@ -1,6 +1,7 @@
 """Defines the enum type for character effects"""
 
-from enum import Enum
+import typing
+from enum import Enum, IntFlag, auto
 
 # Enums
 
@@ -12,3 +13,25 @@ class CharacterEffectType(Enum):
 	silence = "silence",
 	invisible = "invisible",
 	death_rattle = "death rattle",
+
+class CharacterKeyword(IntFlag):
+	# One bit per effect type, in the same order
+	aura = auto()
+	taunt = auto()
+	charge = auto()
+	stealth = auto()
+	silence = auto()
+	invisible = auto()
+	death_rattle = auto()
+
+# Functions
+
+def get_keyword_mask(effect_types: typing.Iterable[CharacterEffectType]):
+	# Plain int, since IntFlag operators run in Python
+	keyword_mask = 0
+	for effect_type in effect_types:
+		keyword_mask |= CharacterKeyword[effect_type.name]
+	return int(keyword_mask)
+
+def get_keyword_types(keyword_mask: int):
+	return {CharacterEffectType[keyword.name] for keyword in CharacterKeyword(keyword_mask)}
@@ -4,16 +4,19 @@ from typing import TYPE_CHECKING
 
 from character.character_effect_types import CharacterEffectType
 from effects.effect_functions import EffectFunction
+from game_log import LogEvent, LogLevel
 from target.query_target import QueryTarget
 from target.target_get import get_available_targets
 
 if TYPE_CHECKING:
-	from character.character_class import Character
+	from character.character_class import Character, EffectState
 	from game_controller import GameController
 
 # Special effect class
 
 class CharacterAbility:
+	__slots__ = ("effect_type", "apply_effect_function", "silence_effect_function", "query_target")
+
 	def __init__(
 			self,
 			effect_type: CharacterEffectType,
@@ -25,55 +28,72 @@ class CharacterAbility:
 		self.apply_effect_function = apply_effect
 		self.silence_effect_function = silence_effect
 		self.query_target = query_target
-		self.is_enabled = False
-		self.is_silenced = False
-
-	def set_enabled(self, enabled):
-		self.is_enabled = enabled
 
-	def apply(self, character: "Character", game: "GameController"):
-		if self.is_enabled:
+	def apply(self, character: "Character", game: "GameController", effect_state: "EffectState"):
+		if effect_state.is_enabled:
 			return
 
+		# Log the character as the source of the effect
+		previous_log_source = game.log_source
+		game.log_source = character.entity_id
+
+		# Charge cost to the character's card
+		if game.cost_accounting is not None:
+			with game.cost_accounting.measure(character.name, "ability apply"):
+				self.__apply(character, game, effect_state)
+		else:
+			self.__apply(character, game, effect_state)
+
+		game.log_source = previous_log_source
+
+	def __apply(self, character: "Character", game: "GameController", effect_state: "EffectState"):
 		# Aura effects
 		if self.effect_type == CharacterEffectType.aura:
-			game.aura.create_aura_source(character, self)
-			self.is_enabled = True
+			game.aura.create_aura_source(character, effect_state)
+			effect_state.is_enabled = True
 
 		# Regular effects
 		else:
 			targets = get_available_targets(self.query_target, game, character)
 			self.apply_effect_function(targets)
-			self.is_enabled = True
+			effect_state.is_enabled = True
 
 		# Save logs
-		game.save_log(
-			f"<{character.commander.name}>'s"
-			f" character [{character.name}]"
-			f" activated effect {self.effect_type}"
-		)
-
-	def silence(self, character: "Character", game: "GameController"):
-		if not self.is_enabled:
+		if game.log_level >= LogLevel.full:
+			game.save_log(LogEvent.effect_activated, character.commander.name, character.entity_id, self.effect_type)
+
+	def silence(self, character: "Character", game: "GameController", effect_state: "EffectState"):
+		if not effect_state.is_enabled:
 			return
 
-		if self.is_silenced:
+		if effect_state.is_silenced:
 			return
 
+		# Log the character as the source of the effect
+		previous_log_source = game.log_source
+		game.log_source = character.entity_id
+
+		# Charge cost to the character's card
+		if game.cost_accounting is not None:
+			with game.cost_accounting.measure(character.name, "ability silence"):
+				self.__silence(character, game, effect_state)
+		else:
+			self.__silence(character, game, effect_state)
+
+		game.log_source = previous_log_source
+
+	def __silence(self, character: "Character", game: "GameController", effect_state: "EffectState"):
 		# Aura effects
 		if self.effect_type == CharacterEffectType.aura:
 			game.aura.remove_aura_source(character)
-			self.is_silenced = True
+			effect_state.is_silenced = True
 
 		# Regular effects
 		else:
 			targets = get_available_targets(self.query_target, game, character)
 			self.silence_effect_function(targets)
-			self.is_silenced = True
+			effect_state.is_silenced = True
 
 		# Save logs
-		game.save_log(
-			f"<{character.commander.name}>'s"
-			f" character [{character.name}]"
-			f" silenced effect {self.effect_type}"
-		)
+		if game.log_level >= LogLevel.full:
+			game.save_log(LogEvent.effect_silenced, character.commander.name, character.entity_id, self.effect_type)
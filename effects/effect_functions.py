@@ -1,9 +1,10 @@
 """Contains common effect functions for spells and character effects"""
 
-import random
 import typing
 from typing import TYPE_CHECKING
 
+from character.character_effect_types import get_keyword_mask
+
 if TYPE_CHECKING:
 	from cards.card_minion import MinionCard
 	from character.character_effect_types import CharacterEffectType
@@ -23,97 +24,148 @@ def get_commanders_set(targets: "TargetsType"):
 
 # Dummy effect
 
-def create_dummy_effect():
-	def dummy_effect(targets: "TargetsType"):
+class DummyEffect:
+	def __call__(self, targets: "TargetsType"):
 		pass
-	return dummy_effect
+
+def create_dummy_effect():
+	return DummyEffect()
 
 # Combined effects
 
-def create_combined_effects(effect_list: list[EffectFunction]):
-	def combined_effects(targets: "TargetsType"):
-		for effect in effect_list:
+class CombinedEffects:
+	def __init__(self, effect_list: list[EffectFunction]):
+		self.effect_list = tuple(effect_list)
+
+	def __call__(self, targets: "TargetsType"):
+		for effect in self.effect_list:
 			effect(targets)
-	return combined_effects
+
+def create_combined_effects(effect_list: list[EffectFunction]):
+	return CombinedEffects(effect_list)
 
 # Damage effects
 
-def create_damage_effect(damage: int):
-	def damage_effect(targets: "TargetsType"):
+class DamageEffect:
+	def __init__(self, damage: int):
+		self.damage = damage
+
+	def __call__(self, targets: "TargetsType"):
 		for target in targets:
-			target.receive_damage(damage)
-	return damage_effect
+			target.receive_damage(self.damage)
 
-def create_destroy_effect():
-	def destroy_effect(targets: "TargetsType"):
+def create_damage_effect(damage: int):
+	return DamageEffect(damage)
+
+class DestroyEffect:
+	def __call__(self, targets: "TargetsType"):
 		for target in targets:
 			target.destroy()
-	return destroy_effect
+
+def create_destroy_effect():
+	return DestroyEffect()
 
 # Healing effects
 
-def create_healing_effect(heal_by: int):
-	def healing_effect(targets: "TargetsType"):
+class HealingEffect:
+	def __init__(self, heal_by: int):
+		self.heal_by = heal_by
+
+	def __call__(self, targets: "TargetsType"):
 		for target in targets:
-			target.restore_health(heal_by)
-	return healing_effect
+			target.restore_health(self.heal_by)
+
+def create_healing_effect(heal_by: int):
+	return HealingEffect(heal_by)
 
 # Change stat effects
 
+class ChangeMaxHealthEffect:
+	def __init__(self, change_by: int):
+		self.change_by = change_by
+
+	def __call__(self, targets: "TargetsType"):
+		for target in targets:
+			target.change_max_health(self.change_by)
+
 def create_change_max_health_effect(change_by: int):
-	def change_max_health_effect(targets: "TargetsType"):
+	return ChangeMaxHealthEffect(change_by)
+
+class ChangeAttackEffect:
+	def __init__(self, change_by: int):
+		self.change_by = change_by
+
+	def __call__(self, targets: "TargetsType"):
 		for target in targets:
-			target.change_max_health(change_by)
-	return change_max_health_effect
+			target.change_attack(self.change_by)
 
 def create_change_attack_effect(change_by: int):
-	def change_attack_effect(targets: "TargetsType"):
-		for target in targets:
-			target.change_attack(change_by)
-	return change_attack_effect
+	return ChangeAttackEffect(change_by)
 
 # Transform effects
 
-def create_stat_edit_effect(morph_properties: typing.Dict[str, typing.Any]):
-	def stat_edit_effect(targets: "TargetsType"):
+class StatEditEffect:
+	def __init__(self, morph_properties: typing.Dict[str, typing.Any]):
+		self.morph_properties = tuple(morph_properties.items())
+
+	def __call__(self, targets: "TargetsType"):
 		for target in targets:
-			for property_name, property_value in morph_properties.items():
+			target.record_change()
+			for property_name, property_value in self.morph_properties:
 				setattr(target, property_name, property_value)
-	return stat_edit_effect
 
-def create_transform_effect(target_card: "MinionCard"):
-	def transform_effect(targets: "TargetsType"):
+def create_stat_edit_effect(morph_properties: typing.Dict[str, typing.Any]):
+	return StatEditEffect(morph_properties)
+
+class TransformEffect:
+	def __init__(self, target_card: "MinionCard"):
+		self.target_card = target_card
+
+	def __call__(self, targets: "TargetsType"):
 		for target in targets:
-			target.set_as_minion(target_card)
-	return transform_effect
+			target.set_as_minion(self.target_card)
+
+def create_transform_effect(target_card: "MinionCard"):
+	return TransformEffect(target_card)
 
 # Character special effects
 
-def create_character_special_effect(add_effects: set["CharacterEffectType"], remove_effects: set["CharacterEffectType"]):
-	def character_special_effect(targets: "TargetsType"):
+class CharacterSpecialEffect:
+	def __init__(self, add_effects: set["CharacterEffectType"], remove_effects: set["CharacterEffectType"]):
+		self.add_mask = get_keyword_mask(add_effects)
+		self.remove_mask = get_keyword_mask(remove_effects)
+
+	def __call__(self, targets: "TargetsType"):
 		for target in targets:
-			# Union update
-			target.active_effect_types |= add_effects
+			# Set added keywords, then clear removed ones
+			target.set_active_keywords((target.active_keywords | self.add_mask) & ~self.remove_mask)
 
-			# Difference update
-			target.active_effect_types -= remove_effects
-	return character_special_effect
+def create_character_special_effect(add_effects: set["CharacterEffectType"], remove_effects: set["CharacterEffectType"]):
+	return CharacterSpecialEffect(add_effects, remove_effects)
 
 # Draw effects
 
-def create_draw_card_effect(cards_count: int):
-	def draw_card_effect(targets: "TargetsType"):
+class DrawCardEffect:
+	def __init__(self, cards_count: int):
+		self.cards_count = cards_count
+
+	def __call__(self, targets: "TargetsType"):
 		if targets:
 			target = targets[0]
 			player = target.commander
-			for _ in range(cards_count):
+			for _ in range(self.cards_count):
 				player.draw_card(True)
-	return draw_card_effect
+
+def create_draw_card_effect(cards_count: int):
+	return DrawCardEffect(cards_count)
 
 # Discard effects
 
-def create_discard_card_effect(cards_count: int):
-	def discard_card_effect(targets: "TargetsType"):
+class DiscardCardEffect:
+	def __init__(self, cards_count: int):
+		self.cards_count = cards_count
+
+	def __call__(self, targets: "TargetsType"):
 		if targets:
 			target = targets[0]
 			player = target.commander
@@ -122,10 +174,12 @@ def create_discard_card_effect(cards_count: int):
 			pass
 
 			# Choose random cards
-			discard_count = min(len(player.hand.cards), cards_count)
-			selected_cards = random.sample(player.hand.cards, discard_count)
+			discard_count = min(len(player.hand.cards), self.cards_count)
+			selected_cards = player.game.rng.sample(player.hand.cards, discard_count)
 
 			# Discard cards
-			for card in selected_cards:
-				player.discard_card(card)
-	return discard_card_effect
+			for card_instance in selected_cards:
+				player.discard_card(card_instance)
+
+def create_discard_card_effect(cards_count: int):
+	return DiscardCardEffect(cards_count)
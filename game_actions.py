@@ -0,0 +1,43 @@
+"""Defines the actions and results of the headless game API"""
+
+from enum import Enum
+
+# Types
+
+# (player index, battlefield position), with position -1 for the player's hero
+type CharacterId = tuple[int, int]
+
+# Enums
+
+class ActionType(Enum):
+	begin_turn = "begin turn",
+	play_minion = "play minion",
+	play_spell = "play spell",
+	attack = "attack",
+	end_turn = "end turn",
+	concede = "concede",
+
+# Action class
+
+class Action:
+	def __init__(self, action_type: ActionType, *args):
+		self.action_type = action_type
+		self.args = args
+
+	def __str__(self):
+		return f"{self.action_type.name}{self.args}"
+
+# Action result class
+
+class ActionResult:
+	def __init__(self, action: Action, success: bool, message=""):
+		self.action = action
+		self.success = success
+		self.message = message
+
+	def __bool__(self):
+		return self.success
+
+	def __str__(self):
+		status = "success" if self.success else "failed"
+		return f"[{self.action}] {status}{f": {self.message}" if self.message else ""}"
@@ -0,0 +1,169 @@
+"""Encodes game states in a fixed binary layout, and stores them in memory-mapped corpora"""
+
+import mmap
+import struct
+from typing import TYPE_CHECKING
+
+from cards.card_base import get_instance_card_id
+from character.character_class import Character, CharacterType
+
+if TYPE_CHECKING:
+	from game_controller import GameController
+	from player_client.player import Player
+
+# Variables
+
+corpus_magic = b"HSGS"
+corpus_version = 1
+
+# Magic, version, player count, record size
+corpus_header = struct.Struct("<4sHHI")
+
+# Round number, player turn
+game_layout = "HB"
+
+# Max mana, mana, fatigue, deck count, hand count
+player_layout = "BBBBB"
+
+# Card id, attack, health, max health, moves left, keyword flags (CharacterKeyword bits)
+character_layout = "HhhhbH"
+character_field_count = len(character_layout)
+
+battlefield_size = 7
+hand_size = 10
+
+# Functions
+
+def get_record_struct(player_count: int):
+	player_fields = player_layout + character_layout * (1 + battlefield_size) + "H" * hand_size
+	return struct.Struct("<" + game_layout + player_fields * player_count)
+
+# Encode functions
+
+def encode_character(character: Character):
+	# Registry card id, with 0 for no card
+	card_id = character.source_card.card_id if character.source_card is not None else 0
+	return card_id, character.attack, character.health, character.max_health, character.moves_left, character.active_keywords
+
+def encode_player(player: "Player"):
+	fields = [
+		player.max_mana_crystal, player.mana_crystal, player.fatigue,
+		player.deck.get_card_count(), len(player.hand.cards),
+	]
+
+	# Hero, then every battlefield slot (empty slots are all zeros)
+	fields.extend(encode_character(player.hero))
+	for character in player.battlefield.characters:
+		if character.character_type != CharacterType.minion:
+			fields.extend((0,) * character_field_count)
+		else:
+			fields.extend(encode_character(character))
+
+	# Hand card ids, padded with 0
+	hand_ids = [get_instance_card_id(card_instance) for card_instance in player.hand.cards[:hand_size]]
+	fields.extend(hand_ids + [0] * (hand_size - len(hand_ids)))
+	return fields
+
+def encode_game_state(game: "GameController", record_struct: struct.Struct = None):
+	if record_struct is None:
+		record_struct = get_record_struct(len(game.players))
+
+	fields = [game.round_number, game.player_turn]
+	for player in game.players:
+		fields.extend(encode_player(player))
+	return record_struct.pack(*fields)
+
+# Decode functions
+
+def decode_character(fields: tuple):
+	card_id, attack, health, max_health, moves_left, flags = fields
+	return {
+		"card_id": card_id,
+		"attack": attack,
+		"health": health,
+		"max_health": max_health,
+		"moves_left": moves_left,
+		"keyword_flags": flags,
+	}
+
+def decode_game_state(record_struct: struct.Struct, buffer, offset=0):
+	# Unpack straight from the buffer, so memory-mapped records aren't copied first
+	fields = record_struct.unpack_from(buffer, offset)
+	round_number, player_turn = fields[:2]
+	position = 2
+
+	players = []
+	while position < len(fields):
+		max_mana_crystal, mana_crystal, fatigue, deck_count, hand_count = fields[position:position + 5]
+		position += 5
+
+		characters = []
+		for _ in range(1 + battlefield_size):
+			characters.append(decode_character(fields[position:position + character_field_count]))
+			position += character_field_count
+
+		hand = fields[position:position + hand_count]
+		position += hand_size
+
+		players.append({
+			"max_mana_crystal": max_mana_crystal,
+			"mana_crystal": mana_crystal,
+			"fatigue": fatigue,
+			"deck_count": deck_count,
+			"hand": hand,
+			"hero": characters[0],
+			"battlefield": characters[1:],
+		})
+
+	return {"round_number": round_number, "player_turn": player_turn, "players": players}
+
+# Corpus writer class
+
+class GameStateCorpusWriter:
+	def __init__(self, path: str, player_count=2):
+		self.record_struct = get_record_struct(player_count)
+		self.record_count = 0
+
+		self.file = open(path, "wb")
+		self.file.write(corpus_header.pack(corpus_magic, corpus_version, player_count, self.record_struct.size))
+
+	def write(self, game: "GameController"):
+		self.file.write(encode_game_state(game, self.record_struct))
+		self.record_count += 1
+
+	def close(self):
+		self.file.close()
+
+# Corpus reader class
+
+class GameStateCorpus:
+	def __init__(self, path: str):
+		self.file = open(path, "rb")
+		self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+		# Validate header
+		magic, version, self.player_count, record_size = corpus_header.unpack_from(self.buffer)
+		if magic != corpus_magic or version != corpus_version:
+			raise ValueError(f"Not a game state corpus: {path}")
+		self.record_struct = get_record_struct(self.player_count)
+		assert self.record_struct.size == record_size
+
+	def __len__(self):
+		return (len(self.buffer) - corpus_header.size) // self.record_struct.size
+
+	def get_offset(self, index: int):
+		if not 0 <= index < len(self):
+			raise IndexError(index)
+		return corpus_header.size + index * self.record_struct.size
+
+	def get_record_bytes(self, index: int):
+		# Zero-copy view of the encoded record
+		offset = self.get_offset(index)
+		return memoryview(self.buffer)[offset:offset + self.record_struct.size]
+
+	def read(self, index: int):
+		return decode_game_state(self.record_struct, self.buffer, self.get_offset(index))
+
+	def close(self):
+		self.buffer.close()
+		self.file.close()
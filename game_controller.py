@@ -1,6 +1,9 @@
 """Contains the class for running the game"""
 
+import array
 import random
+import uuid
+from collections import deque
 
 from aesthetics import horizontal_rule
 from aura import Aura
@@ -8,7 +11,30 @@ from cards.card_minion import MinionCard
 from cards.card_spell import SpellCard
 from cards.card_storage import minion_cards, spell_cards
 from character.character_class import Character, CharacterType
+from game_actions import Action, ActionResult, ActionType, CharacterId
+from game_hash import GameStateHasher
+from game_journal import GameJournal
+from game_log import EntityId, LogEntry, LogEvent, LogLevel, StreamingLogWriter, render_log_entry
+from instrumentation import CostAccounting, Instrumentation
+from output_sink import OutputSink, ConsoleSink
 from player_client.player import Player
+from target.query_target import QueryTarget, TargetsType, TargetAlliance, TargetCharacterType, TargetChooseMethod
+
+# Variables
+
+attack_query_target = QueryTarget(
+	TargetAlliance.enemy, TargetCharacterType.any_character,
+	(1, 1), TargetChooseMethod.user_input,
+	respect_taunt=True,
+	respect_stealth=True
+)
+
+timed_phases = (
+	"start_turn", "turn_draw_card",
+	"play_minion", "play_spell", "turn_play_minion_card_at", "turn_play_spell_card",
+	"attack", "resolve_deaths", "end_turn",
+)
+counted_functions = ("save_log",)
 
 # Functions
 
@@ -30,20 +56,93 @@ def reset_minion_moves(player: Player):
 	for character in player.battlefield.characters:
 		character.reset_moves()
 
+def get_compact_rng_state(rng: random.Random):
+	# Store the Mersenne Twister words as 32-bit array items, instead of a tuple of int objects
+	version, internal_state, gauss_next = rng.getstate()
+	return version, array.array("I", internal_state), gauss_next
+
+def set_compact_rng_state(rng: random.Random, rng_state: tuple):
+	version, internal_state, gauss_next = rng_state
+	rng.setstate((version, tuple(internal_state), gauss_next))
+
 # Game instance class
 
 class GameController:
-	def __init__(self, players: list[Player]):
+	def __init__(
+			self,
+			players: list[Player],
+			output: OutputSink = None,
+			seed: int = None,
+			log_level=LogLevel.full,
+	):
 		self.players = players
+		self.seed = seed if seed is not None else random.randrange(2 ** 32)
+		self.rng = random.Random(self.seed)
+		self.output = output if output else ConsoleSink()
 		self.round_number = 0
 		self.player_turn = 0
+		self.is_turn_begun = False
 		self.aura = Aura()
-		self.game_logs: list[str] = []
+		self.game_logs: list[LogEntry] | deque[LogEntry] = []
+		self.log_level = log_level
+		self.log_writer: StreamingLogWriter | None = None
+		self.log_game_id: str | None = None
+		self.log_source: EntityId | None = None
+		self.instrumentation: Instrumentation | None = None
+		self.cost_accounting: CostAccounting | None = None
+		self.journal: GameJournal | None = None
+		self.state_hasher: GameStateHasher | None = None
+		self.is_tracking_changes = False
+
+		# Setup & successful actions, so the game can be replayed from its seed
+		self.player_setups = [
+			(player.name, [card.name for card in player.deck.get_remaining_cards()]) for player in players
+		]
+		self.action_log: list[Action] = []
+
+	def __getstate__(self):
+		# Drop process-local helpers when pickling: log writer, instrumentation wrappers, cost accounting & journal
+		state = self.__dict__.copy()
+		for function_name in timed_phases + counted_functions:
+			state.pop(function_name, None)
+		state.update(
+			log_writer=None, instrumentation=None, cost_accounting=None,
+			journal=None, state_hasher=None, is_tracking_changes=False,
+		)
+		return state
 
 	# General functions
 
+	def stream_logs(self, log_writer: StreamingLogWriter, tail_size=100):
+		# Write logs through the writer, keeping only a bounded tail in memory
+		self.log_writer = log_writer
+		self.game_logs = deque(self.game_logs, tail_size)
+
+		# Seeds repeat across runs appending to the same file, so streamed games get unique ids
+		self.log_game_id = uuid.uuid4().hex
+
+	def instrument(self, instrumentation: Instrumentation):
+		# Wrap methods on this instance only, so uninstrumented games run the plain methods
+		self.instrumentation = instrumentation
+		for phase in timed_phases:
+			setattr(self, phase, instrumentation.wrap_timed(phase, getattr(self, phase)))
+		for function_name in counted_functions:
+			setattr(self, function_name, instrumentation.wrap_counted(function_name, getattr(self, function_name)))
+
+	def start_journal(self):
+		# Record state changes from now on, so they can be undone back to a marker
+		self.journal = GameJournal(self)
+		self.is_tracking_changes = True
+		return self.journal
+
+	def start_state_hash(self):
+		# Keep a state hash, updated from the changed objects only
+		self.state_hasher = GameStateHasher(self)
+		self.is_tracking_changes = True
+		return self.state_hasher
+
 	def shuffle_players(self):
-		random.shuffle(self.players)
+		self.rng.shuffle(self.players)
 
 	def display_battlefields(self, is_detailed: bool):
 		for player_index in range(len(self.players)):
@@ -75,10 +174,34 @@ class GameController:
 			return
 		return self.players[index]
 
+	def get_character(self, character_id: CharacterId) -> Character | None:
+		player_index, position = character_id
+
+		# Get player
+		player = self.get_player_by_index(player_index)
+		if not player:
+			return
+
+		# Get hero
+		if position == -1:
+			return player.hero
+
+		# Get battlefield character
+		if not 0 <= position < len(player.battlefield.characters):
+			return
+		return player.battlefield.characters[position]
+
+	def get_character_id(self, character: Character) -> CharacterId:
+		player_index = self.players.index(character.commander)
+		if character == character.commander.hero:
+			return player_index, -1
+		return player_index, character.commander.battlefield.characters.index(character)
+
 	# Start functions
 
 	def start_game(self):
-		self.save_log("Starting new game.")
+		if self.log_level >= LogLevel.game:
+			self.save_log(LogEvent.game_start, self.seed)
 
 		# Set game for each player
 		for player in self.players:
@@ -89,7 +212,8 @@ class GameController:
 
 		# Shuffle player cards
 		for player in self.players:
-			player.deck.shuffle_cards()
+			player.record_change(player.deck)
+			player.deck.shuffle_cards(self.rng)
 
 		# Draw 3 cards for first player
 		for _ in range(3):
@@ -104,6 +228,23 @@ class GameController:
 		self.round_number = 0
 		self.__next_round()
 
+	def begin_turn(self):
+		action = Action(ActionType.begin_turn)
+
+		# Validate turn not begun, since it refills mana & draws a card
+		if self.is_turn_begun:
+			return ActionResult(action, False, "Turn already begun!")
+
+		# Start turn
+		self.is_turn_begun = True
+		self.start_turn()
+
+		# Draw a card for the player
+		card = self.turn_draw_card()
+
+		# Return result
+		return self.__log_action(ActionResult(action, True, f"Drew [{card.name}]." if card else ""))
+
 	# Resolve states
 
 	def resolve_deaths(self):
@@ -160,93 +301,199 @@ class GameController:
 
 	# Turn play
 
-	def turn_play_minion_card_at(self, card_index: int, position: int):
+	def play_minion(self, card_index: int, position: int):
+		action = Action(ActionType.play_minion, card_index, position)
 		player = self.turn_get_player()
 
+		# Validate turn begun
+		if not self.is_turn_begun:
+			return ActionResult(action, False, "Turn not begun!")
+
 		# Validate card index
-		if not 0 <= card_index < len(player.hand.cards):
-			print("Not a Hand card!")
-			return
+		if not player.hand.has_card_index(card_index):
+			return ActionResult(action, False, "Not a Hand card!")
 
 		# Get card
-		card = player.hand.cards[card_index]
+		card = player.hand.get_card(card_index)
 
 		# Validate card type
 		if not isinstance(card, MinionCard):
-			print("Not a Minion card!")
-			return
+			return ActionResult(action, False, "Not a Minion card!")
 
 		# Check card playable
-		if not player.can_play_card(card):
-			print("Can't play card!")
-			return
+		if not player.can_play_card(card_index):
+			return ActionResult(action, False, "Can't play card!")
+
+		# Validate position
+		if not 0 <= position < len(player.battlefield.characters):
+			return ActionResult(action, False, "Not a battlefield position!")
+		if player.battlefield.characters[position].character_type != CharacterType.none:
+			return ActionResult(action, False, "Not an empty character!")
 
 		# Play card
-		success = player.play_minion_card(card, position)
+		success = bool(player.play_minion_card(card_index, position))
+
+		# Resolve deaths
+		self.resolve_deaths()
 
-		return success
+		return self.__log_action(ActionResult(action, success))
 
-	def turn_play_spell_card(self, card_index: int):
+	def play_spell(self, card_index: int, targets_list: list[list[CharacterId]]):
+		action = Action(ActionType.play_spell, card_index, targets_list)
 		player = self.turn_get_player()
 
+		# Validate turn begun
+		if not self.is_turn_begun:
+			return ActionResult(action, False, "Turn not begun!")
+
 		# Validate card index
-		if not 0 <= card_index < len(player.hand.cards):
-			return
+		if not player.hand.has_card_index(card_index):
+			return ActionResult(action, False, "Not a Hand card!")
 
 		# Get card
-		card = player.hand.cards[card_index]
+		card = player.hand.get_card(card_index)
 
 		# Validate card type
 		if not isinstance(card, SpellCard):
-			return
+			return ActionResult(action, False, "Not a Spell card!")
+
+		# Check card playable
+		if not player.can_play_card(card_index):
+			return ActionResult(action, False, "Can't play card!")
+
+		# Get chosen targets
+		chosen_targets_list = []
+		for character_ids in targets_list:
+			targets = [self.get_character(character_id) for character_id in character_ids]
+			if None in targets:
+				return ActionResult(action, False, "Not a character!")
+			chosen_targets_list.append(targets)
+
+		# Resolve targets for each spell
+		resolved_targets_list = card.resolve_targets_list(self, chosen_targets_list)
+		if not resolved_targets_list:
+			return ActionResult(action, False, "Not correct targets selected!")
 
 		# Play card
-		success = player.play_spell_card(card)
+		success = bool(player.play_spell_card(card_index, resolved_targets_list))
+
+		# Resolve deaths
+		self.resolve_deaths()
+
+		return self.__log_action(ActionResult(action, success))
 
-		return success
+	def turn_play_minion_card_at(self, card_index: int, position: int):
+		result = self.play_minion(card_index, position)
+		if not result:
+			if self.output.is_enabled:
+				self.output.write(result.message)
+			return
+		return True
+
+	def turn_play_spell_card(self, card_index: int, targets_list: list[TargetsType]):
+		# Get targets ids
+		character_ids_list = []
+		for targets in targets_list:
+			character_ids_list.append([self.get_character_id(target) for target in targets])
+
+		result = self.play_spell(card_index, character_ids_list)
+		if not result:
+			if self.output.is_enabled:
+				self.output.write(result.message)
+			return
+		return True
 
 	# Turn attack
 
-	def attack(self, attacker: Character, target: Character):
+	def attack(self, attacker_id: CharacterId, target_id: CharacterId):
+		action = Action(ActionType.attack, attacker_id, target_id)
 		player = self.turn_get_player()
 
+		# Validate turn begun
+		if not self.is_turn_begun:
+			return ActionResult(action, False, "Turn not begun!")
+
+		# Get characters
+		attacker = self.get_character(attacker_id)
+		target = self.get_character(target_id)
+		if not attacker or not target:
+			return ActionResult(action, False, "Not a character!")
+
 		# Validate commander
 		if attacker.commander != player:
-			return
+			return ActionResult(action, False, "Not your character!")
 
 		# Check if the attacker can attack
 		if not attacker_can_attack(attacker):
-			return
+			return ActionResult(action, False, "Character has no moves remaining!")
+
+		# Validate target
+		try:
+			attack_query_target.check_character_valid(attacker, target)
+		except Exception as e:
+			return ActionResult(action, False, str(e))
 
 		# Save logs
-		self.save_log(
-			f"(ATTACK)"
-			f" <{attacker.commander.name}>'s"
-			f" character [{attacker.name}]"
-			f" attacked <{target.commander.name}>'s"
-			f" character [{target.name}]."
-		)
+		if self.log_level >= LogLevel.game:
+			self.save_log(
+				LogEvent.attack, attacker.commander.name, attacker.entity_id, target.commander.name, target.entity_id
+			)
 
 		# Attack
+		previous_log_source = self.log_source
+		self.log_source = attacker.entity_id
 		target.receive_damage(attacker.get_attack())
+		self.log_source = target.entity_id
 		attacker.receive_damage(target.get_attack())
+		self.log_source = previous_log_source
 
 		# On attack event
 		attacker.on_attack()
 
 		# Reduce moves
+		attacker.record_change()
 		attacker.moves_left -= 1
 
+		# Resolve deaths
+		self.resolve_deaths()
+
+		return self.__log_action(ActionResult(action, True))
+
+	# Perform action
+
+	def perform_action(self, action: Action):
+		match action.action_type:
+			case ActionType.begin_turn:
+				return self.begin_turn()
+			case ActionType.play_minion:
+				return self.play_minion(*action.args)
+			case ActionType.play_spell:
+				return self.play_spell(*action.args)
+			case ActionType.attack:
+				return self.attack(*action.args)
+			case ActionType.end_turn:
+				return self.end_turn()
+			case ActionType.concede:
+				return self.concede()
+		return ActionResult(action, False, "Unknown action!")
+
+	def __log_action(self, result: ActionResult):
+		if result:
+			self.action_log.append(result.action)
+		return result
+
 	# End turn
 
 	def end_turn(self):
-		# Reset minion moves
+		action = Action(ActionType.end_turn)
 		player = self.turn_get_player()
 
 		# Save logs
-		self.save_log(f"Ended turn for <{player.name}>.")
+		if self.log_level >= LogLevel.game:
+			self.save_log(LogEvent.end_turn, player.name)
 
 		# Get next player
+		self.is_turn_begun = False
 		is_looped = False
 		for i in range(len(self.players)):
 			# Increment player turn
@@ -265,10 +512,19 @@ class GameController:
 		if is_looped:
 			self.__next_round()
 
+		# Flush turn output
+		self.output.flush()
+
+		return self.__log_action(ActionResult(action, True))
+
 	def __next_round(self):
 		# Increment round number
 		self.round_number += 1
 
+		# Save logs
+		if self.log_level >= LogLevel.game:
+			self.save_log(LogEvent.new_round, self.round_number)
+
 	# Reset functions
 
 	def __reset_mana(self, player: Player):
@@ -282,6 +538,8 @@ class GameController:
 		player = self.turn_get_player()
 		player.concede()
 
+		return self.__log_action(ActionResult(Action(ActionType.concede), True))
+
 	# Game end functions
 
 	def is_game_ended(self):
@@ -311,15 +569,74 @@ class GameController:
 
 		# Save logs
 		winner = self.get_winner()
-		winner_str = ""
 		if winner:
-			winner_str = f"<{winner}> wins!"
+			if self.log_level >= LogLevel.game:
+				self.save_log(LogEvent.game_end_win, winner)
 		else:
-			winner_str = f"It's a tie."
-		self.save_log(f"Game ended! {winner_str}")
+			if self.log_level >= LogLevel.game:
+				self.save_log(LogEvent.game_end_tie)
+
+		# Flush game output & logs
+		self.output.flush()
+		if self.log_writer is not None:
+			self.log_writer.flush()
+
+	# State functions
+
+	def get_state(self):
+		return (
+			tuple(self.players), self.round_number, self.player_turn, self.is_turn_begun,
+			get_compact_rng_state(self.rng), len(self.game_logs), len(self.action_log), self.log_source,
+		)
+
+	def set_state(self, state: tuple):
+		(
+			players, self.round_number, self.player_turn, self.is_turn_begun,
+			rng_state, log_count, action_count, self.log_source,
+		) = state
+		self.players = list(players)
+		set_compact_rng_state(self.rng, rng_state)
+		del self.action_log[action_count:]
+
+		# Drop logs saved after the state (streamed logs are already written)
+		if isinstance(self.game_logs, list):
+			del self.game_logs[log_count:]
+
+	def record_change(self, changed_object):
+		if self.journal is not None:
+			self.journal.record(changed_object)
+		if self.state_hasher is not None:
+			self.state_hasher.mark_changed(changed_object)
+
+	def record_restore(self, restored_object):
+		# Restored states bypass the change hooks, but still change the state hash
+		if self.state_hasher is not None:
+			self.state_hasher.mark_changed(restored_object)
+
+	def get_state_objects(self):
+		state_objects = [self, self.aura]
+		for player in self.players:
+			state_objects.extend(player.get_state_objects())
+		return state_objects
+
+	def snapshot(self):
+		# Card definitions & abilities are shared; only mutable state is captured
+		return tuple((state_object, state_object.get_state()) for state_object in self.get_state_objects())
+
+	def restore(self, snapshot: tuple):
+		for state_object, state in snapshot:
+			state_object.set_state(state)
+			self.record_restore(state_object)
 
 	# Log functions
 
-	def save_log(self, log: str):
-		timestamp = self.get_timestamp()
-		self.game_logs.append(f"[{timestamp}]: {log}")
+	def save_log(self, event: LogEvent, *args):
+		# Callers check log_level first, so disabled events don't even build their arguments
+		# Store the event; text is only rendered when the logs are read
+		entry = (event, self.round_number, self.player_turn, *args)
+		self.game_logs.append(entry)
+		if self.log_writer is not None:
+			self.log_writer.write(self.log_game_id, entry)
+
+	def get_log_lines(self):
+		return [render_log_entry(entry) for entry in self.game_logs]
@@ -0,0 +1,227 @@
+"""Keeps a Zobrist game state hash, updated incrementally as objects change"""
+
+import array
+import random
+from typing import TYPE_CHECKING
+
+from cards.card_base import card_id_mask, cards_by_id
+from cards.card_minion import MinionCard
+from character.character_class import Character, CharacterType
+from character.character_effect_types import CharacterKeyword
+from player_client.deck import Deck
+from player_client.hand import Hand
+from player_client.player import Player
+
+if TYPE_CHECKING:
+	from game_controller import GameController
+
+# Variables
+
+# Bounds of the key table; stats and rounds past them share the last bucket
+max_player_count = 8
+max_deck_size = 60
+max_hand_size = 10
+character_slot_count = 8  # Hero & battlefield positions
+stat_bucket_count = 32
+round_bucket_count = 128
+
+character_stats = ("attack", "health", "max_health", "defense", "moves_left")
+player_stats = ("max_mana_crystal", "mana_crystal", "fatigue")
+character_type_indexes = {character_type: index for index, character_type in enumerate(CharacterType)}
+
+# Built on first use, once every card is registered
+key_table: "HashKeyTable | None" = None
+
+# Functions
+
+def get_stat_bucket(value: int):
+	return min(max(value, 0), stat_bucket_count - 1)
+
+def get_key_table():
+	global key_table
+	if key_table is None:
+		effect_count = max(
+			(len(card.card_effects) for card in cards_by_id[1:] if isinstance(card, MinionCard)), default=0
+		)
+		key_table = HashKeyTable(len(cards_by_id), effect_count)
+	return key_table
+
+# Key table class
+
+class HashKeyTable:
+	def __init__(self, card_count: int, effect_count: int):
+		# Fixed seed, so hashes are stable across processes
+		rng = random.Random("game state hash")
+
+		def create_keys(count: int):
+			return array.array("Q", [rng.getrandbits(64) for _ in range(count)])
+
+		self.card_count = card_count
+		self.effect_count = effect_count
+
+		# Offsets in each character slot's keys: type, card id, stat buckets, keywords, then effect flags
+		self.card_offset = len(CharacterType)
+		self.stat_offset = self.card_offset + card_count
+		self.keyword_offset = self.stat_offset + len(character_stats) * stat_bucket_count
+		self.effect_offset = self.keyword_offset + len(CharacterKeyword)
+		character_key_count = self.effect_offset + effect_count * 2
+
+		self.character_keys = [
+			[create_keys(character_key_count) for _ in range(character_slot_count)] for _ in range(max_player_count)
+		]
+		self.player_keys = [create_keys(len(player_stats) * stat_bucket_count) for _ in range(max_player_count)]
+		self.hand_keys = [create_keys(card_count * (max_hand_size + 1)) for _ in range(max_player_count)]
+		self.deck_keys = [create_keys(max_deck_size * card_count) for _ in range(max_player_count)]
+		self.round_keys = create_keys(round_bucket_count)
+		self.turn_keys = create_keys(max_player_count)
+
+	# Object hash functions
+
+	def get_character_hash(self, player_index: int, slot_index: int, character: Character):
+		keys = self.character_keys[player_index][slot_index]
+		object_hash = keys[character_type_indexes[character.character_type]]
+
+		# Empty slots hash the same, whatever minion died there
+		if character.character_type == CharacterType.none:
+			return object_hash
+
+		card_id = character.source_card.card_id if character.source_card is not None else 0
+		object_hash ^= keys[self.card_offset + card_id]
+		for stat_index, stat in enumerate(character_stats):
+			object_hash ^= keys[self.stat_offset + stat_index * stat_bucket_count + get_stat_bucket(getattr(character, stat))]
+
+		# One key per keyword bit
+		keywords = character.active_keywords
+		while keywords:
+			keyword_bit = keywords & -keywords
+			object_hash ^= keys[self.keyword_offset + keyword_bit.bit_length() - 1]
+			keywords ^= keyword_bit
+
+		for effect_index, effect_state in enumerate(character.effect_states[:self.effect_count]):
+			if effect_state.is_active:
+				object_hash ^= keys[self.effect_offset + effect_index * 2]
+			if effect_state.is_silenced:
+				object_hash ^= keys[self.effect_offset + effect_index * 2 + 1]
+		return object_hash
+
+	def get_hand_hash(self, player_index: int, hand: Hand):
+		# Hand order doesn't matter, so each card is keyed by its copy number
+		keys = self.hand_keys[player_index]
+		card_counts: dict[int, int] = {}
+		object_hash = 0
+		for card_instance in hand.cards:
+			card_id = card_instance & card_id_mask
+			card_counts[card_id] = min(card_counts.get(card_id, 0) + 1, max_hand_size)
+			object_hash ^= keys[card_id * (max_hand_size + 1) + card_counts[card_id]]
+		return object_hash
+
+	def get_deck_hash(self, player_index: int, cards: list[int], start: int, end: int):
+		# Positions count from the bottom, so drawing from the top leaves the other cards' keys as they are
+		keys = self.deck_keys[player_index]
+		object_hash = 0
+		for card_index in range(start, end):
+			position = len(cards) - 1 - card_index
+			object_hash ^= keys[position * self.card_count + (cards[card_index] & card_id_mask)]
+		return object_hash
+
+	def get_player_hash(self, player_index: int, player: Player):
+		keys = self.player_keys[player_index]
+		object_hash = 0
+		for stat_index, stat in enumerate(player_stats):
+			object_hash ^= keys[stat_index * stat_bucket_count + get_stat_bucket(getattr(player, stat))]
+		return object_hash
+
+	def get_turn_hash(self, round_number: int, player_turn: int):
+		return self.round_keys[min(round_number, round_bucket_count - 1)] ^ self.turn_keys[player_turn]
+
+	def get_object_hash(self, slot: tuple, hashed_object):
+		player_index, slot_index = slot
+		if isinstance(hashed_object, Character):
+			return self.get_character_hash(player_index, slot_index, hashed_object)
+		elif isinstance(hashed_object, Hand):
+			return self.get_hand_hash(player_index, hashed_object)
+		elif isinstance(hashed_object, Deck):
+			return self.get_deck_hash(player_index, hashed_object.cards, hashed_object.draw_index, len(hashed_object.cards))
+		return self.get_player_hash(player_index, hashed_object)
+
+# State hasher class
+
+class GameStateHasher:
+	def __init__(self, game: "GameController"):
+		if len(game.players) > max_player_count:
+			raise ValueError(f"State hashes support up to {max_player_count} players")
+		if any(len(player.deck.cards) > max_deck_size for player in game.players):
+			raise ValueError(f"State hashes support decks of up to {max_deck_size} cards")
+
+		self.game = game
+		self.key_table = get_key_table()
+		self.build_slots()
+
+	def build_slots(self):
+		# Slots depend on the player order, so they're rebuilt when it changes (e.g. on the start shuffle)
+		self.players = list(self.game.players)
+		self.state_hash = 0
+
+		# (player index, slot) of each object, and its hash XOR-ed into the state hash
+		self.slots: dict[int, tuple] = {}
+		self.object_hashes: dict[int, int] = {}
+
+		# Deck cards & draw index when last hashed, so draws only XOR out the drawn cards
+		self.deck_positions: dict[int, tuple[list[int], int]] = {}
+
+		# Objects changed since the last hash, by id
+		self.changed_objects: dict[int, object] = {}
+
+		for slot, hashed_object in self.get_slot_objects():
+			self.slots[id(hashed_object)] = slot
+			self.changed_objects[id(hashed_object)] = hashed_object
+
+	def get_slot_objects(self):
+		for player_index in range(len(self.game.players)):
+			player = self.game.players[player_index]
+			yield (player_index, "player"), player
+			yield (player_index, "hand"), player.hand
+			yield (player_index, "deck"), player.deck
+			yield (player_index, 0), player.hero
+			for position in range(len(player.battlefield.characters)):
+				yield (player_index, position + 1), player.battlefield.characters[position]
+
+	def mark_changed(self, changed_object):
+		# Objects are only rehashed when the hash is read
+		if id(changed_object) in self.slots:
+			self.changed_objects[id(changed_object)] = changed_object
+
+	def __get_changed_hash(self, object_id: int, changed_object):
+		if not isinstance(changed_object, Deck):
+			return self.key_table.get_object_hash(self.slots[object_id], changed_object)
+
+		# Same card list: only the cards drawn (or undrawn) since the last hash change
+		deck_position = self.deck_positions.get(object_id)
+		self.deck_positions[object_id] = (changed_object.cards, changed_object.draw_index)
+		if deck_position is None or deck_position[0] is not changed_object.cards:
+			return self.key_table.get_object_hash(self.slots[object_id], changed_object)
+		start, end = sorted((deck_position[1], changed_object.draw_index))
+		return self.object_hashes[object_id] ^ self.key_table.get_deck_hash(
+			self.slots[object_id][0], changed_object.cards, start, end
+		)
+
+	def get_hash(self):
+		if self.players != self.game.players:
+			self.build_slots()
+
+		# Swap out the old hashes of changed objects for their new ones
+		for object_id, changed_object in self.changed_objects.items():
+			object_hash = self.__get_changed_hash(object_id, changed_object)
+			self.state_hash ^= self.object_hashes.get(object_id, 0) ^ object_hash
+			self.object_hashes[object_id] = object_hash
+		self.changed_objects.clear()
+
+		# Turn counters change every turn, so they're hashed directly
+		return self.state_hash ^ self.key_table.get_turn_hash(self.game.round_number, self.game.player_turn)
+
+	def get_full_hash(self):
+		# Hash everything from scratch, to check the incremental hash
+		state_hash = 0
+		for slot, hashed_object in self.get_slot_objects():
+			state_hash ^= self.key_table.get_object_hash(slot, hashed_object)
+		return state_hash ^ self.key_table.get_turn_hash(self.game.round_number, self.game.player_turn)
@@ -0,0 +1,81 @@
+"""Records game state changes so they can be undone and redone"""
+
+import typing
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+	from game_controller import GameController
+
+# Types
+
+# (changed object, its state before the change)
+type JournalEntry = tuple[typing.Any, tuple]
+
+# (journal entry count, game log count, action count)
+type JournalMarker = tuple[int, int, int]
+
+# Journal class
+
+class GameJournal:
+	def __init__(self, game: "GameController"):
+		self.game = game
+		self.entries: list[JournalEntry] = []
+		self.redo_batches: list[tuple[list[JournalEntry], list, list]] = []
+
+		# Objects recorded since the last marker, so each is only recorded once in between
+		self.recorded_ids: set[int] = set()
+
+	# Record functions
+
+	def record(self, changed_object):
+		if id(changed_object) in self.recorded_ids:
+			return
+		self.recorded_ids.add(id(changed_object))
+		self.entries.append((changed_object, changed_object.get_state()))
+
+		# New changes discard the undone changes
+		self.redo_batches.clear()
+
+	def mark(self):
+		# Start a new section, recording the turn counters & RNG which change without hooks
+		self.recorded_ids.clear()
+		marker = (len(self.entries), len(self.game.game_logs), len(self.game.action_log))
+		self.record(self.game)
+		return marker
+
+	# Undo functions
+
+	def undo(self, marker: JournalMarker):
+		entry_count, log_count, action_count = marker
+
+		# Keep logs & actions after the marker for redo (streamed logs are already written)
+		undone_logs = []
+		if isinstance(self.game.game_logs, list):
+			undone_logs = self.game.game_logs[log_count:]
+		undone_actions = self.game.action_log[action_count:]
+
+		# Roll back changes after the marker, newest first
+		undone_entries = []
+		while len(self.entries) > entry_count:
+			changed_object, state = self.entries.pop()
+			undone_entries.append((changed_object, changed_object.get_state()))
+			changed_object.set_state(state)
+			self.game.record_restore(changed_object)
+
+		self.recorded_ids.clear()
+		self.redo_batches.append((undone_entries, undone_logs, undone_actions))
+
+	def redo(self):
+		if not self.redo_batches:
+			return False
+
+		# Reapply the last undone changes, oldest first
+		undone_entries, undone_logs, undone_actions = self.redo_batches.pop()
+		self.recorded_ids.clear()
+		for changed_object, state in reversed(undone_entries):
+			self.entries.append((changed_object, changed_object.get_state()))
+			changed_object.set_state(state)
+			self.game.record_restore(changed_object)
+		self.game.game_logs.extend(undone_logs)
+		self.game.action_log.extend(undone_actions)
+		return True
@@ -0,0 +1,323 @@
+"""Defines structured game log events and renders them as text when read"""
+
+import bisect
+import json
+import queue
+import threading
+import typing
+from enum import IntEnum
+
+from cards.card_base import CardInstance, card_id_mask, get_instance_card, registered_cards
+
+# Enums
+
+class LogEvent(IntEnum):
+	game_start = 0
+	game_end_win = 1
+	game_end_tie = 2
+	new_round = 3
+	end_turn = 4
+	concede = 5
+	attack = 6
+	play_minion = 7
+	minion_played = 8
+	play_spell = 9
+	spell_played = 10
+	draw = 11
+	overdraw = 12
+	fatigue = 13
+	discard = 14
+	damage = 15
+	heal = 16
+	destroyed = 17
+	lose_stealth = 18
+	effect_activated = 19
+	effect_silenced = 20
+	aura_gained = 21
+	aura_lost = 22
+
+class LogLevel(IntEnum):
+	off = 0
+	game = 1  # Plays, attacks, deaths, turn / round / game ends
+	full = 2  # Every draw, damage, aura change and effect activation
+
+# Types
+
+# (event, round number, player turn, *event arguments)
+type LogEntry = tuple
+
+# Card instance qualified by its player's index, or a hero's player name
+type EntityId = int | str
+
+# Variables
+
+# Card instances are only unique within a deck, so the player's index goes above them
+entity_player_shift = 32
+
+log_templates = {
+	LogEvent.game_start: "Starting new game.",
+	LogEvent.game_end_win: "Game ended! <{0}> wins!",
+	LogEvent.game_end_tie: "Game ended! It's a tie.",
+	LogEvent.new_round: "New round: round {0}.",
+	LogEvent.end_turn: "Ended turn for <{0}>.",
+	LogEvent.concede: "<{0}> conceded.",
+	LogEvent.attack: "(ATTACK) <{0}>'s character [{1}] attacked <{2}>'s character [{3}].",
+	LogEvent.play_minion: "(PLAY) <{0}> played [{1}] minion at battlefield position {2}.",
+	LogEvent.minion_played: "[{0}] minion finish played.",
+	LogEvent.play_spell: "(PLAY) <{0}> played [{1}] spell.",
+	LogEvent.spell_played: "[{0}] spell finish played.",
+	LogEvent.draw: "<{0}> drew the card [{1}].",
+	LogEvent.overdraw: "<{0}> overdrew card [{1}].",
+	LogEvent.fatigue: "<{0}> is experiencing fatigue.",
+	LogEvent.discard: "<{0}> discarded [{1}].",
+	LogEvent.damage: "<{0}>'s character [{1}] received {2} damage, {3} health remaining.",
+	LogEvent.heal: "<{0}>'s character [{1}] restored to {2} health.",
+	LogEvent.destroyed: "<{0}>'s character [{1}] was destroyed.",
+	LogEvent.lose_stealth: "<{0}>'s character [{1}] lost stealth.",
+	LogEvent.effect_activated: "<{0}>'s character [{1}] activated effect {2}",
+	LogEvent.effect_silenced: "<{0}>'s character [{1}] silenced effect {2}",
+	LogEvent.aura_gained: "<{0}>'s character [{1}] gained aura effect from [{2}].",
+	LogEvent.aura_lost: "<{0}>'s character [{1}] lost aura effect from [{2}].",
+}
+
+# Role of each event argument: player, entity (character / card id), source (entity id), or None
+log_argument_roles = {
+	LogEvent.game_start: (None,),
+	LogEvent.game_end_win: ("player",),
+	LogEvent.game_end_tie: (),
+	LogEvent.new_round: (None,),
+	LogEvent.end_turn: ("player",),
+	LogEvent.concede: ("player",),
+	LogEvent.attack: ("player", "source", "player", "entity"),
+	LogEvent.play_minion: ("player", "entity", None),
+	LogEvent.minion_played: ("entity",),
+	LogEvent.play_spell: ("player", "entity"),
+	LogEvent.spell_played: ("entity",),
+	LogEvent.draw: ("player", "entity"),
+	LogEvent.overdraw: ("player", "entity"),
+	LogEvent.fatigue: ("player",),
+	LogEvent.discard: ("player", "entity"),
+	LogEvent.damage: ("player", "entity", None, None, "source"),
+	LogEvent.heal: ("player", "entity", None, "source"),
+	LogEvent.destroyed: ("player", "entity"),
+	LogEvent.lose_stealth: ("player", "entity"),
+	LogEvent.effect_activated: ("player", "entity", None),
+	LogEvent.effect_silenced: ("player", "entity", None),
+	LogEvent.aura_gained: ("player", "entity", "source"),
+	LogEvent.aura_lost: ("player", "entity", "source"),
+}
+
+# Functions
+
+def create_entity_id(player_index: int, card_instance: CardInstance) -> EntityId:
+	return (player_index << entity_player_shift) | card_instance
+
+def get_entity_name(entity_id: EntityId):
+	# Heroes are identified by their player's name
+	if isinstance(entity_id, str):
+		return entity_id
+	return get_instance_card(entity_id).name
+
+def get_entity_card_key(entity_id: EntityId) -> int | str:
+	# Card id of every copy of a card, or a hero's player name
+	if isinstance(entity_id, str):
+		return entity_id
+	return entity_id & card_id_mask
+
+def get_card_key(card: int | str) -> int | str:
+	# Card names resolve to card ids, other names are heroes
+	if isinstance(card, str) and card in registered_cards:
+		return registered_cards[card].card_id
+	return card
+
+def render_log_entry(entry: LogEntry):
+	event, round_number, player_turn, *args = entry
+
+	# Entities are logged by id, and only resolved to names here
+	for arg_index, role in enumerate(log_argument_roles[event]):
+		if role in ("entity", "source") and args[arg_index] is not None:
+			args[arg_index] = get_entity_name(args[arg_index])
+	return f"[Round {round_number}, Turn {player_turn}]: {log_templates[event].format(*args)}"
+
+def read_log_file(path: str):
+	# Yield (game id, log entry) pairs from a JSONL log file
+	with open(path) as file:
+		for line in file:
+			game_id, event, *rest = json.loads(line)
+			yield game_id, (LogEvent(event), *rest)
+
+# Streaming writer class
+
+class StreamingLogWriter:
+	def __init__(self, path: str, buffer_size=1024, max_pending_buffers=16):
+		self.file = open(path, "a")
+		self.buffer_size = buffer_size
+		self.buffer: list[str] = []
+
+		# Games on different threads may share a writer
+		self.buffer_lock = threading.Lock()
+
+		# Error of the background writer, raised on flush / close
+		self.error: Exception | None = None
+
+		# Bounded queue, so a slow disk holds back the game instead of growing memory
+		self.pending_buffers: queue.Queue[list[str] | None] = queue.Queue(max_pending_buffers)
+		self.writer_thread = threading.Thread(target=self.__write_loop, daemon=True)
+		self.writer_thread.start()
+
+	def __write_loop(self):
+		while True:
+			lines = self.pending_buffers.get()
+			try:
+				if lines is None:
+					break
+
+				# After an error, keep taking buffers so writers and flushes never wait forever
+				if self.error is None:
+					self.file.write("\n".join(lines) + "\n")
+					self.file.flush()
+			except Exception as error:
+				self.error = error
+			finally:
+				self.pending_buffers.task_done()
+
+	def write(self, game_id: str, entry: LogEntry):
+		# Enum arguments (e.g. effect types) are stored as their display text
+		line = json.dumps((game_id, *entry), default=str)
+
+		# Queue full buffers under the lock too, so each game's lines stay in order
+		with self.buffer_lock:
+			self.buffer.append(line)
+			if len(self.buffer) >= self.buffer_size:
+				self.pending_buffers.put(self.buffer)
+				self.buffer = []
+
+	def flush(self):
+		with self.buffer_lock:
+			if self.buffer:
+				self.pending_buffers.put(self.buffer)
+				self.buffer = []
+
+		# Wait until the background writer is done
+		self.pending_buffers.join()
+		if self.error is not None:
+			raise self.error
+
+	def close(self):
+		try:
+			self.flush()
+		finally:
+			self.pending_buffers.put(None)
+			self.writer_thread.join()
+			self.file.close()
+
+# Index functions
+
+def contains_sorted(sorted_values: list[int], value: int):
+	position = bisect.bisect_left(sorted_values, value)
+	return position < len(sorted_values) and sorted_values[position] == value
+
+# Index class
+
+class GameLogIndex:
+	def __init__(self):
+		self.entries: list[tuple[str, LogEntry]] = []
+		self.by_game: dict[str, list[int]] = {}
+		self.by_event: dict[LogEvent, list[int]] = {}
+		self.by_round: dict[int, list[int]] = {}
+		self.by_player: dict[str, list[int]] = {}
+		self.by_entity: dict[EntityId, list[int]] = {}
+		self.by_source: dict[EntityId, list[int]] = {}
+
+		# Entities & sources by card, across copies and players
+		self.by_card: dict[int | str, list[int]] = {}
+		self.by_source_card: dict[int | str, list[int]] = {}
+
+	# Add functions
+
+	@staticmethod
+	def __add_to_index(index: dict, key, entry_index: int):
+		entry_indexes = index.setdefault(key, [])
+		if not entry_indexes or entry_indexes[-1] != entry_index:
+			entry_indexes.append(entry_index)
+
+	def add_entry(self, game_id: str, entry: LogEntry):
+		entry_index = len(self.entries)
+		self.entries.append((game_id, entry))
+
+		# Index general fields
+		event, round_number, _, *args = entry
+		self.__add_to_index(self.by_game, game_id, entry_index)
+		self.__add_to_index(self.by_event, event, entry_index)
+		self.__add_to_index(self.by_round, round_number, entry_index)
+
+		# Index arguments by role
+		for role, arg in zip(log_argument_roles[event], args):
+			if role is None or arg is None:
+				continue
+			match role:
+				case "player":
+					self.__add_to_index(self.by_player, arg, entry_index)
+				case "entity":
+					self.__add_to_index(self.by_entity, arg, entry_index)
+					self.__add_to_index(self.by_card, get_entity_card_key(arg), entry_index)
+				case "source":
+					card_key = get_entity_card_key(arg)
+					self.__add_to_index(self.by_source, arg, entry_index)
+					self.__add_to_index(self.by_entity, arg, entry_index)
+					self.__add_to_index(self.by_source_card, card_key, entry_index)
+					self.__add_to_index(self.by_card, card_key, entry_index)
+
+	def add_game(self, game_id: str, entries: typing.Iterable[LogEntry]):
+		for entry in entries:
+			self.add_entry(game_id, entry)
+
+	def add_log_file(self, path: str):
+		for game_id, entry in read_log_file(path):
+			self.add_entry(game_id, entry)
+
+	# Query functions
+
+	def query(
+			self,
+			event: LogEvent | tuple[LogEvent, ...] = None,
+			player: str = None,
+			entity: EntityId = None,
+			source: EntityId = None,
+			card: int | str = None,
+			source_card: int | str = None,
+			round_number: int = None,
+			game_id: str = None,
+	) -> list[tuple[str, LogEntry]]:
+		# Get candidate entry indexes for each given criterion
+		candidates: list[list[int]] = []
+		if event is not None:
+			events = event if isinstance(event, tuple) else (event,)
+			if len(events) == 1:
+				candidates.append(self.by_event.get(events[0], []))
+			else:
+				candidates.append(sorted(
+					entry_index for event in events for entry_index in self.by_event.get(event, [])
+				))
+		for index, key in (
+				(self.by_player, player),
+				(self.by_entity, entity),
+				(self.by_source, source),
+				(self.by_card, get_card_key(card)),
+				(self.by_source_card, get_card_key(source_card)),
+				(self.by_round, round_number),
+				(self.by_game, game_id),
+		):
+			if key is not None:
+				candidates.append(index.get(key, []))
+
+		# No criteria matches everything
+		if not candidates:
+			return list(self.entries)
+
+		# Filter the smallest candidate list by binary search in the other sorted lists
+		candidates.sort(key=len)
+		return [
+			self.entries[entry_index] for entry_index in candidates[0]
+			if all(contains_sorted(entry_indexes, entry_index) for entry_indexes in candidates[1:])
+		]
@@ -1,24 +1,53 @@
 """Defines the gameplay loop"""
 
-from copy import deepcopy
+import typing
+from enum import Enum
 
 import game_controller
 from player_gameplay import player_actions
 from aesthetics import horizontal_rule, input_to_continue
+from cards.card_spell import SpellCard
 from cards.card_storage import spell_cards, minion_cards
+from game_actions import Action, ActionResult, ActionType
 from player_client.deck import Deck
 from player_client.player import Player
+from target.query_target import TargetChooseMethod
+
+# Enums
+
+class DecisionType(Enum):
+	choose_action = "choose action",
+	choose_targets = "choose targets",
+	confirm_spell = "confirm spell",
+
+# Decision class
+
+class Decision:
+	def __init__(
+			self,
+			decision_type: DecisionType,
+			game: game_controller.GameController,
+			subject=None,
+			last_result: ActionResult = None,
+	):
+		self.decision_type = decision_type
+		self.game = game
+		self.subject = subject
+		self.last_result = last_result
+
+# Types
+
+type SteppedGameLoop = typing.Generator[Decision, typing.Any, game_controller.GameController]
 
 # Variables
 
-default_deck_cards = list(minion_cards.values()) + list(spell_cards.values())
-default_deck_cards *= 2
+default_deck_cards = (*minion_cards.values(), *spell_cards.values()) * 2
 
 # Helper functions
 
 def create_player(deck: Deck, name_prompt="Player name: "):
 	player_name = input(name_prompt)
-	player = Player(player_name, deepcopy(deck))
+	player = Player(player_name, deck)
 	return player
 
 # Local functions
@@ -43,20 +72,14 @@ def general_game_loop(game_players: list[Player]):
 			previous_round = game.round_number
 			game.turn_display_round()
 
-			# Save logs
-			game.save_log(f"New round: round {game.round_number}.")
-
 		# Horizontal rule
 		horizontal_rule(50)
 
-		# Start turn
-		game.start_turn()
-
 		# Display player
 		game.turn_display_player()
 
-		# Draw a card for the player
-		game.turn_draw_card()
+		# Start turn & draw a card for the player
+		game.begin_turn()
 
 		# Input player actions
 		while True:
@@ -106,6 +129,86 @@ def general_game_loop(game_players: list[Player]):
 	# Return game
 	return game
 
+def stepped_game_loop(game: game_controller.GameController) -> SteppedGameLoop:
+	# Start game
+	game.start_game()
+
+	# Game loop phase
+	last_result = None
+	while not game.is_game_ended():
+		# Start turn & draw a card for the player
+		game.begin_turn()
+
+		# Player actions
+		while not game.is_game_ended():
+			# Choose action
+			action: Action = yield Decision(DecisionType.choose_action, game, last_result=last_result)
+			if action.action_type == ActionType.end_turn:
+				break
+
+			# Choose spell targets & confirm spell if not given
+			if action.action_type == ActionType.play_spell and action.args[1] is None:
+				card_index = action.args[0]
+				player = game.turn_get_player()
+				card = player.hand.get_card(card_index) if player.hand.has_card_index(card_index) else None
+				if isinstance(card, SpellCard):
+					# Choose targets for each user input spell
+					targets_list = []
+					for spell in card.spells:
+						targets = []
+						if spell.query_target.choose_method == TargetChooseMethod.user_input:
+							targets = yield Decision(DecisionType.choose_targets, game, spell)
+						targets_list.append(targets)
+
+					# Confirm spell
+					is_confirmed = yield Decision(DecisionType.confirm_spell, game, card)
+					if not is_confirmed:
+						last_result = None
+						continue
+					action = Action(ActionType.play_spell, card_index, targets_list)
+
+			# Perform action
+			last_result = game.perform_action(action)
+
+			# Break actions
+			if action.action_type == ActionType.concede:
+				break
+
+		# End turn
+		game.end_turn()
+		last_result = None
+
+	# End game
+	game.end_game()
+
+	# Return game
+	return game
+
+def run_stepped_games(
+		games: list[game_controller.GameController],
+		decide_batch: typing.Callable[[list[Decision]], list[typing.Any]],
+):
+	# Start game loops
+	game_loops = [stepped_game_loop(game) for game in games]
+	decisions = [next(game_loop) for game_loop in game_loops]
+
+	# Step all games until they end, answering pending decisions in batches
+	active_indexes = list(range(len(game_loops)))
+	while active_indexes:
+		answers = decide_batch([decisions[index] for index in active_indexes])
+
+		next_active_indexes = []
+		for index, answer in zip(active_indexes, answers):
+			try:
+				decisions[index] = game_loops[index].send(answer)
+				next_active_indexes.append(index)
+			except StopIteration:
+				pass
+		active_indexes = next_active_indexes
+
+	# Return games
+	return games
+
 def game_single_player():
 	# Create players
 	player_1 = create_player(Deck(default_deck_cards))
@@ -0,0 +1,312 @@
+"""Records games as their seed & actions, and replays them headlessly"""
+
+import array
+import base64
+import bisect
+import json
+import typing
+import zlib
+
+from cards.card_base import Card, cards_by_id, get_card_by_id
+from cards.card_minion import MinionCard
+from character.character_class import Character, CharacterType, EffectState
+from game_actions import Action, ActionType
+from game_binary import encode_game_state
+from game_controller import GameController
+from game_log import LogLevel
+from output_sink import NullSink
+from player_client.deck import Deck
+from player_client.player import Player
+from simulation import get_cards
+
+# Types
+
+# (round number, action index, compressed game state before that action)
+type Keyframe = tuple[int, int, bytes]
+
+# Action functions
+
+def encode_action(action: Action):
+	return [action.action_type.name, *action.args]
+
+def decode_action(data: list):
+	action_type = ActionType[data[0]]
+	args = data[1:]
+
+	# JSON turns character ids into lists
+	match action_type:
+		case ActionType.play_spell:
+			card_index, targets_list = args
+			args = [card_index, [[tuple(character_id) for character_id in character_ids] for character_ids in targets_list]]
+		case ActionType.attack:
+			args = [tuple(character_id) for character_id in args]
+
+	return Action(action_type, *args)
+
+# Game record class
+
+class GameRecord:
+	def __init__(
+			self,
+			seed: int,
+			player_setups: list[tuple[str, list[str]]],
+			actions: list[Action],
+			final_state: str = None,
+			keyframes: list[Keyframe] = None,
+	):
+		self.seed = seed
+		self.player_setups = player_setups
+		self.actions = actions
+
+		# Hex of the binary final state, to verify replays against
+		self.final_state = final_state
+
+		# Full game states at round starts, so seeking only replays from the nearest one
+		self.keyframes = keyframes if keyframes is not None else []
+
+	@staticmethod
+	def from_game(game: GameController):
+		return GameRecord(
+			game.seed,
+			game.player_setups,
+			list(game.action_log),
+			encode_game_state(game).hex(),
+		)
+
+	# JSON functions
+
+	def to_json(self):
+		return json.dumps({
+			"seed": self.seed,
+			"players": self.player_setups,
+			"actions": [encode_action(action) for action in self.actions],
+			"final_state": self.final_state,
+			"keyframe_states": [
+				(round_number, action_index, base64.b64encode(data).decode())
+				for round_number, action_index, data in self.keyframes
+			],
+		})
+
+	@staticmethod
+	def from_json(text: str):
+		data = json.loads(text)
+		return GameRecord(
+			data["seed"],
+			[(player_name, deck_card_names) for player_name, deck_card_names in data["players"]],
+			[decode_action(action_data) for action_data in data["actions"]],
+			data["final_state"],
+			[
+				(round_number, action_index, base64.b64decode(keyframe_data))
+				for round_number, action_index, keyframe_data in data.get("keyframe_states", [])
+			],
+		)
+
+# Record file functions
+
+def save_game_records(path: str, records: typing.Iterable[GameRecord]):
+	# One JSON record per line
+	with open(path, "w") as file:
+		for record in records:
+			file.write(record.to_json() + "\n")
+
+def load_game_records(path: str):
+	with open(path) as file:
+		for line in file:
+			yield GameRecord.from_json(line)
+
+# Replay functions
+
+def create_replay_game(record: GameRecord, log_level=LogLevel.off):
+	players = [
+		Player(player_name, Deck(get_cards(deck_card_names)))
+		for player_name, deck_card_names in record.player_setups
+	]
+	return GameController(players, NullSink(), record.seed, log_level)
+
+def replay_game(record: GameRecord, log_level=LogLevel.off):
+	# Game randomness only depends on the seed, so replaying the actions reproduces the game
+	game = create_replay_game(record, log_level)
+	game.start_game()
+	for action_index in range(len(record.actions)):
+		result = game.perform_action(record.actions[action_index])
+		if not result:
+			raise ValueError(f"Replay failed at action {action_index}: {result}")
+
+	# End game
+	game.end_game()
+	return game
+
+def verify_replay(record: GameRecord):
+	# Check the replayed final state matches the recorded one
+	try:
+		game = replay_game(record)
+	except ValueError:
+		return False
+	return encode_game_state(game).hex() == record.final_state
+
+def verify_game_records(records: typing.Iterable[GameRecord]):
+	# Return indexes of records whose replays don't match
+	return [record_index for record_index, record in enumerate(records) if not verify_replay(record)]
+
+# Keyframe state functions
+
+# Game states hold references to game objects, so keyframes store them as tagged ids:
+# {"player": setup index}, {"character": character id}, {"effect_state": effect state index},
+# {"card": card id}, {"character_type": name}, {"frozenset": items} and {"array": (type code, array index)}
+
+def get_ability_ids():
+	# Abilities are shared definitions, found by their card id & effect index
+	ability_ids = {}
+	for card in cards_by_id[1:]:
+		if isinstance(card, MinionCard):
+			for effect_index, ability in enumerate(card.card_effects):
+				ability_ids.setdefault(id(ability), (card.card_id, effect_index))
+	return ability_ids
+
+def encode_keyframe(game: GameController, setup_players: list[Player], previous_arrays: list[bytes] = ()):
+	effect_state_indexes: dict[int, int] = {}
+	effect_states: list[list] = []
+	arrays: list[bytes] = []
+	ability_ids = get_ability_ids()
+
+	def encode_value(value):
+		if value is None or isinstance(value, (bool, int, float, str)):
+			return value
+		if isinstance(value, (tuple, list)):
+			return [encode_value(item) for item in value]
+		if isinstance(value, array.array):
+			arrays.append(value.tobytes())
+			return {"array": (value.typecode, len(arrays) - 1)}
+		if isinstance(value, frozenset):
+			return {"frozenset": [encode_value(item) for item in value]}
+		if isinstance(value, CharacterType):
+			return {"character_type": value.name}
+		if isinstance(value, Card):
+			return {"card": value.card_id}
+		if isinstance(value, Player):
+			return {"player": setup_players.index(value)}
+		if isinstance(value, Character):
+			return {"character": game.get_character_id(value)}
+		if isinstance(value, EffectState):
+			if id(value) not in effect_state_indexes:
+				effect_state_indexes[id(value)] = len(effect_states)
+				effect_states.append([
+					ability_ids[id(value.effect)], value.is_active, value.is_enabled, value.is_silenced,
+				])
+			return {"effect_state": effect_state_indexes[id(value)]}
+		raise TypeError(f"Can't store {type(value).__name__} in a keyframe")
+
+	states = [encode_value(state_object.get_state()) for state_object in game.get_state_objects()]
+
+	# The RNG state is most of a keyframe, and only changes when a round uses randomness
+	stored_arrays = [
+		None if array_index < len(previous_arrays) and array_bytes == previous_arrays[array_index]
+		else base64.b64encode(array_bytes).decode()
+		for array_index, array_bytes in enumerate(arrays)
+	]
+	keyframe = {"effect_states": effect_states, "arrays": stored_arrays, "states": states}
+	return zlib.compress(json.dumps(keyframe).encode()), arrays
+
+def get_keyframe_arrays(record: GameRecord, keyframe_index: int):
+	# Arrays left out of a keyframe are the same as in an earlier one
+	keyframe_arrays: list[bytes | None] = []
+	while keyframe_index >= 0 and (not keyframe_arrays or None in keyframe_arrays):
+		stored_arrays = json.loads(zlib.decompress(record.keyframes[keyframe_index][2]))["arrays"]
+		if not keyframe_arrays:
+			keyframe_arrays = [None] * len(stored_arrays)
+		for array_index, stored_array in enumerate(stored_arrays):
+			if keyframe_arrays[array_index] is None and stored_array is not None:
+				keyframe_arrays[array_index] = base64.b64decode(stored_array)
+		keyframe_index -= 1
+	return keyframe_arrays
+
+def decode_keyframe(record: GameRecord, keyframe_index: int):
+	# Rebuild the game from its setup, then set the stored state on its objects
+	game = create_replay_game(record)
+	setup_players = list(game.players)
+	_, action_index, data = record.keyframes[keyframe_index]
+	keyframe = json.loads(zlib.decompress(data))
+	arrays = get_keyframe_arrays(record, keyframe_index)
+
+	effect_states = []
+	for (card_id, effect_index), is_active, is_enabled, is_silenced in keyframe["effect_states"]:
+		effect_state = EffectState(get_card_by_id(card_id).card_effects[effect_index])
+		effect_state.is_active, effect_state.is_enabled, effect_state.is_silenced = is_active, is_enabled, is_silenced
+		effect_states.append(effect_state)
+
+	def decode_value(value):
+		if isinstance(value, list):
+			return [decode_value(item) for item in value]
+		if not isinstance(value, dict):
+			return value
+		(tag, tagged_value), = value.items()
+		match tag:
+			case "frozenset":
+				return frozenset(decode_value(item) for item in tagged_value)
+			case "character_type":
+				return CharacterType[tagged_value]
+			case "card":
+				return get_card_by_id(tagged_value)
+			case "player":
+				return setup_players[tagged_value]
+			case "character":
+				return game.get_character(tuple(tagged_value))
+			case "effect_state":
+				return effect_states[tagged_value]
+			case "array":
+				typecode, array_index = tagged_value
+				return array.array(typecode, arrays[array_index])
+		raise ValueError(f"Unknown keyframe value: {tag}")
+
+	# The game state comes first and sets the player order, which character ids depend on
+	game_state, *states = keyframe["states"]
+	game.set_state(decode_value(game_state))
+	for player in game.players:
+		player.set_game(game)
+	game.restore(tuple(zip(game.get_state_objects()[1:], (decode_value(state) for state in states))))
+
+	game.action_log = list(record.actions[:action_index])
+	return game
+
+# Keyframe functions
+
+def build_keyframes(record: GameRecord, round_interval=1):
+	# Replay the game, storing its state at the start of the game and of every few rounds
+	game = create_replay_game(record)
+	setup_players = list(game.players)
+	game.start_game()
+	data, arrays = encode_keyframe(game, setup_players)
+	record.keyframes = [(game.round_number, 0, data)]
+
+	for action_index in range(len(record.actions)):
+		round_number = game.round_number
+		result = game.perform_action(record.actions[action_index])
+		if not result:
+			raise ValueError(f"Replay failed at action {action_index}: {result}")
+		if game.round_number != round_number and game.round_number % round_interval == 0:
+			data, arrays = encode_keyframe(game, setup_players, arrays)
+			record.keyframes.append((game.round_number, action_index + 1, data))
+
+	return record.keyframes
+
+def seek_action(record: GameRecord, action_index: int):
+	# Restore the last keyframe at or before the action, then replay the remaining actions
+	if not record.keyframes:
+		build_keyframes(record)
+	keyframe_index = bisect.bisect_right([keyframe[1] for keyframe in record.keyframes], action_index) - 1
+	game = decode_keyframe(record, keyframe_index)
+	for action in record.actions[len(game.action_log):action_index]:
+		game.perform_action(action)
+	return game
+
+def seek_turn(record: GameRecord, round_number: int, player_turn=0):
+	# Find the first action at or after the turn, replaying from the round's keyframe
+	if not record.keyframes:
+		build_keyframes(record)
+	keyframe_index = max(bisect.bisect_right([keyframe[0] for keyframe in record.keyframes], round_number) - 1, 0)
+	game = decode_keyframe(record, keyframe_index)
+	action_index = len(game.action_log)
+	while action_index < len(record.actions) and (game.round_number, game.player_turn) < (round_number, player_turn):
+		game.perform_action(record.actions[action_index])
+		action_index += 1
+	return game
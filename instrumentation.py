@@ -0,0 +1,130 @@
+"""Contains optional timers and counters for finding where games spend their time"""
+
+import time
+import typing
+
+# Instrumentation class
+
+class Instrumentation:
+	def __init__(self):
+		self.timer_totals: dict[str, float] = {}
+		self.timer_calls: dict[str, int] = {}
+		self.counters: dict[str, int] = {}
+
+	# Record functions
+
+	def count(self, name: str):
+		self.counters[name] = self.counters.get(name, 0) + 1
+
+	def add_time(self, name: str, elapsed_time: float):
+		self.timer_totals[name] = self.timer_totals.get(name, 0) + elapsed_time
+		self.timer_calls[name] = self.timer_calls.get(name, 0) + 1
+
+	def merge(self, other: "Instrumentation"):
+		for name, elapsed_time in other.timer_totals.items():
+			self.timer_totals[name] = self.timer_totals.get(name, 0) + elapsed_time
+			self.timer_calls[name] = self.timer_calls.get(name, 0) + other.timer_calls[name]
+		for name, count in other.counters.items():
+			self.counters[name] = self.counters.get(name, 0) + count
+
+	# Wrap functions
+
+	def wrap_timed(self, name: str, function: typing.Callable):
+		def timed_function(*args, **kwargs):
+			start_time = time.perf_counter()
+			try:
+				return function(*args, **kwargs)
+			finally:
+				self.add_time(name, time.perf_counter() - start_time)
+		return timed_function
+
+	def wrap_counted(self, name: str, function: typing.Callable):
+		def counted_function(*args, **kwargs):
+			self.count(name)
+			return function(*args, **kwargs)
+		return counted_function
+
+	# Display functions
+
+	def get_report(self):
+		lines = [f"{"Phase":30} {"Calls":>10} {"Total (ms)":>12} {"Mean (us)":>12}"]
+		for name, total_time in sorted(self.timer_totals.items(), key=lambda item: -item[1]):
+			calls = self.timer_calls[name]
+			lines.append(f"{name:30} {calls:>10} {total_time * 1e3:>12.2f} {total_time / calls * 1e6:>12.2f}")
+
+		lines.append("")
+		lines.append(f"{"Counter":30} {"Calls":>10}")
+		for name, count in sorted(self.counters.items(), key=lambda item: -item[1]):
+			lines.append(f"{name:30} {count:>10}")
+		return "\n".join(lines)
+
+# Cost accounting classes
+
+class CostMeasure:
+	def __init__(self, accounting: "CostAccounting", card_name: str, category: str):
+		self.accounting = accounting
+		self.card_name = card_name
+		self.category = category
+		self.start_time = 0.0
+
+	def __enter__(self):
+		self.accounting.child_times.append(0.0)
+		self.start_time = time.perf_counter()
+		return self
+
+	def __exit__(self, *exc_info):
+		elapsed_time = time.perf_counter() - self.start_time
+
+		# Charge own time, excluding nested measures
+		child_time = self.accounting.child_times.pop()
+		self.accounting.charge(self.card_name, self.category, elapsed_time - child_time)
+		if self.accounting.child_times:
+			self.accounting.child_times[-1] += elapsed_time
+
+class CostAccounting:
+	def __init__(self):
+		self.cost_totals: dict[tuple[str, str], float] = {}
+		self.cost_calls: dict[tuple[str, str], int] = {}
+		self.child_times: list[float] = []
+
+	# Record functions
+
+	def measure(self, card_name: str, category: str):
+		return CostMeasure(self, card_name, category)
+
+	def charge(self, card_name: str, category: str, elapsed_time: float):
+		key = (card_name, category)
+		self.cost_totals[key] = self.cost_totals.get(key, 0) + elapsed_time
+		self.cost_calls[key] = self.cost_calls.get(key, 0) + 1
+
+	def merge(self, other: "CostAccounting"):
+		for key, elapsed_time in other.cost_totals.items():
+			self.cost_totals[key] = self.cost_totals.get(key, 0) + elapsed_time
+			self.cost_calls[key] = self.cost_calls.get(key, 0) + other.cost_calls[key]
+
+	# Display functions
+
+	def get_card_totals(self):
+		card_totals: dict[str, float] = {}
+		for (card_name, _), elapsed_time in self.cost_totals.items():
+			card_totals[card_name] = card_totals.get(card_name, 0) + elapsed_time
+		return card_totals
+
+	def get_table(self):
+		total_time = sum(self.cost_totals.values()) or 1
+
+		# Per card & category
+		lines = [f"{"Card":22} {"Category":16} {"Calls":>10} {"Total (ms)":>12} {"Share":>8}"]
+		for (card_name, category), elapsed_time in sorted(self.cost_totals.items(), key=lambda item: -item[1]):
+			calls = self.cost_calls[(card_name, category)]
+			lines.append(
+				f"{card_name:22} {category:16} {calls:>10}"
+				f" {elapsed_time * 1e3:>12.2f} {elapsed_time / total_time:>8.1%}"
+			)
+
+		# Per card
+		lines.append("")
+		lines.append(f"{"Card":22} {"Total (ms)":>12} {"Share":>8}")
+		for card_name, elapsed_time in sorted(self.get_card_totals().items(), key=lambda item: -item[1]):
+			lines.append(f"{card_name:22} {elapsed_time * 1e3:>12.2f} {elapsed_time / total_time:>8.1%}")
+		return "\n".join(lines)
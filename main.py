@@ -1,6 +1,10 @@
 """Defines the program's starting logic"""
 
+import sys
+
 import game_controller
+import game_record
+import simulation
 from aesthetics import horizontal_rule, input_to_continue
 from game_loop import game_single_player, game_multiple_players_1v1
 
@@ -40,7 +44,7 @@ def main_game():
 
 		# Get game info
 		winner = game.get_winner()
-		game_logs = game.game_logs
+		game_logs = game.get_log_lines()
 
 		# End game
 		horizontal_rule()
@@ -75,5 +79,39 @@ def main_game():
 
 	print("Goodbye!")
 
+def simulate(game_count: int, player_count=2, worker_count: int = None):
+	# Run bot-vs-bot games with the default deck
+	return simulation.simulate(game_count, player_count=player_count, worker_count=worker_count)
+
+def verify_replays(path: str):
+	# Replay recorded games and report the ones whose final states changed
+	records = list(game_record.load_game_records(path))
+	mismatched_indexes = game_record.verify_game_records(records)
+	print(f"Replayed {len(records)} games, {len(mismatched_indexes)} mismatched.")
+	for record_index in mismatched_indexes:
+		print(f"	Record {record_index} (seed {records[record_index].seed})")
+	return mismatched_indexes
+
+def check_threads(game_count=64, thread_count=8):
+	# Play seeded games on a thread pool and compare them with the same games played one by one
+	is_isolated = simulation.check_thread_isolation(game_count, thread_count)
+	print(f"Played {game_count} games on {thread_count} threads: {"isolated" if is_isolated else "MISMATCHED"}.")
+	return is_isolated
+
 if __name__ == "__main__":
-	main_game()
+	# Usage: main.py simulate [game count] [player count] [worker count]
+	#        main.py replay [records path]
+	#        main.py check-threads [game count] [thread count]
+	if len(sys.argv) > 1 and sys.argv[1] == "simulate":
+		arguments = [int(argument) for argument in sys.argv[2:5]]
+		if not arguments:
+			arguments = [1000]
+		simulate(*arguments)
+	elif len(sys.argv) > 2 and sys.argv[1] == "replay":
+		verify_replays(sys.argv[2])
+	elif len(sys.argv) > 1 and sys.argv[1] == "check-threads":
+		arguments = [int(argument) for argument in sys.argv[2:4]]
+		if not check_threads(*arguments):
+			sys.exit(1)
+	else:
+		main_game()
@@ -0,0 +1,35 @@
+"""Contains output sinks for messages printed by the game engine"""
+
+# Output sink classes
+
+class OutputSink:
+	# Callers skip building messages for disabled sinks
+	is_enabled = True
+
+	def write(self, message: str):
+		pass
+
+	def flush(self):
+		pass
+
+class ConsoleSink(OutputSink):
+	def write(self, message: str):
+		print(message)
+
+class NullSink(OutputSink):
+	is_enabled = False
+
+class BufferedSink(OutputSink):
+	def __init__(self):
+		self.messages: list[str] = []
+
+	def write(self, message: str):
+		self.messages.append(message)
+
+	def flush(self):
+		if not self.messages:
+			return
+
+		# Print buffered messages at once
+		print("\n".join(self.messages))
+		self.messages.clear()
@@ -2,7 +2,8 @@
 
 from typing import TYPE_CHECKING
 
-from character.character_class import Character, CharacterType
+from character.character_class import Character, CharacterType, taunt_keyword
+from game_log import EntityId
 
 if TYPE_CHECKING:
 	from cards.card_minion import MinionCard
@@ -11,32 +12,49 @@ if TYPE_CHECKING:
 # Battlefield class
 
 class Battlefield:
+	__slots__ = ("commander", "characters", "keyword_mask")
+
 	def __init__(self, player: "Player"):
 		self.commander = player
 		self.characters = []
 		for _ in range(7):
 			self.characters.append(Character(player))
 
-	def add_minion_at(self, minion: "MinionCard", position: int):
+		# Union of the characters' visible keywords, rebuilt when read after a change
+		self.keyword_mask: int = None
+
+	def add_minion_at(self, minion: "MinionCard", position: int, entity_id: EntityId):
 		# Validate position
 		if not 0 <= position < len(self.characters):
-			print("Not a battlefield position!")
+			if self.commander.game.output.is_enabled:
+				self.commander.game.output.write("Not a battlefield position!")
 			return
 
 		# Validate no character
 		if self.characters[position].character_type != CharacterType.none:
-			print("Not an empty character!")
+			if self.commander.game.output.is_enabled:
+				self.commander.game.output.write("Not an empty character!")
 			return
 
 		# Play minion card
-		self.characters[position].set_as_minion(minion)
+		self.characters[position].set_as_minion(minion, entity_id)
+
+	# Keyword functions
+
+	def clear_keyword_mask(self):
+		self.keyword_mask = None
+
+	def get_keyword_mask(self):
+		if self.keyword_mask is None:
+			keyword_mask = 0
+			for character in self.characters:
+				keyword_mask |= character.get_visible_keywords()
+			self.keyword_mask = keyword_mask
+		return self.keyword_mask
 
 	def has_taunt(self):
 		# Check if any character has "taunt" effect
-		for character in self.characters:
-			if character.has_active_taunt():
-				return True
-		return False
+		return bool(self.get_keyword_mask() & taunt_keyword)
 
 	# Display
 
@@ -1,23 +1,51 @@
 """Handles a player's card deck"""
 
 import random
-from copy import deepcopy
 
-from cards.card_base import Card
+from cards.card_base import Card, CardInstance, create_card_instance, get_instance_card
 
 class Deck:
+	__slots__ = ("cards", "draw_index")
+
 	def __init__(self, cards: list[Card]):
-		self.cards = deepcopy(cards)
+		# Registered card ids, numbered so each copy of a card is a distinct instance
+		self.cards: list[CardInstance] = [
+			create_card_instance(card, instance_number) for instance_number, card in enumerate(cards)
+		]
+
+		# Draws move a cursor instead of removing cards from the front
+		self.draw_index = 0
+
+	def shuffle_cards(self, rng: random.Random):
+		# Shuffle the remaining cards into a new list, so saved states can share the old one
+		remaining_cards = self.cards[self.draw_index:]
+		rng.shuffle(remaining_cards)
+		self.cards = remaining_cards
+		self.draw_index = 0
+
+	def get_card_count(self):
+		return len(self.cards) - self.draw_index
 
-	def shuffle_cards(self):
-		random.shuffle(self.cards)
+	def get_remaining_cards(self):
+		return [get_instance_card(card_instance) for card_instance in self.cards[self.draw_index:]]
 
 	def draw_card(self):
-		if self.cards:
-			return self.cards.pop(0)
+		if self.draw_index < len(self.cards):
+			self.draw_index += 1
+			return self.cards[self.draw_index - 1]
 		else:
 			return None
 
 	def remove_top_card(self):
-		if self.cards:
-			return self.cards.pop(0)
+		if self.draw_index < len(self.cards):
+			self.draw_index += 1
+			return self.cards[self.draw_index - 1]
+
+	# State functions
+
+	def get_state(self):
+		# The card list is never changed in place, so it's shared rather than copied
+		return self.cards, self.draw_index
+
+	def set_state(self, state: tuple):
+		self.cards, self.draw_index = state
@@ -1,32 +1,51 @@
 """Handles a player's drawn cards"""
 
-from cards.card_base import Card
+from cards.card_base import CardInstance, get_instance_card
 
 class Hand:
+	__slots__ = ("cards",)
+
 	def __init__(self):
-		self.cards = []
+		# Card instances (card id & instance number), looked up in the card registry
+		self.cards: list[CardInstance] = []
+
+	def get_card(self, card_index: int):
+		return get_instance_card(self.cards[card_index])
 
-	def add_card(self, card: Card):
-		self.cards.append(card)
+	def has_card_index(self, card_index: int):
+		return 0 <= card_index < len(self.cards)
 
-	def remove_card(self, card: Card):
-		self.cards.remove(card)
+	def add_card(self, card_instance: CardInstance):
+		self.cards.append(card_instance)
+
+	def remove_card(self, card_instance: CardInstance):
+		self.cards.remove(card_instance)
 
 	def pop_card(self, card_index=-1):
-		self.cards.pop(card_index)
+		return self.cards.pop(card_index)
+
+	# State functions
+
+	def get_state(self):
+		return tuple(self.cards)
+
+	def set_state(self, state: tuple):
+		self.cards = list(state)
+
+	# Display functions
 
 	def get_display(self, is_detailed=False):
 		result_str_list = []
 		if is_detailed:
 			# Full card detail
 			for card_index in range(len(self.cards)):
-				card = self.cards[card_index]
+				card = self.get_card(card_index)
 				result_str_list.append(f"\t{card_index:2}. {f"[{card}]":25}")
 			result_str = "\n".join(result_str_list)
 		else:
 			# Card name + mana cost
 			for card_index in range(len(self.cards)):
-				card = self.cards[card_index]
+				card = self.get_card(card_index)
 				result_str_list.append(f"{f"[{card.name} (m: {card.mana_cost})]"}")
 			result_str = "\t" + ",   ".join(result_str_list)
 
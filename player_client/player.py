@@ -2,13 +2,13 @@
 
 from typing import TYPE_CHECKING
 
-from cards.card_base import Card
-from cards.card_minion import MinionCard
-from cards.card_spell import SpellCard
+from cards.card_base import CardInstance, get_instance_card
+from game_log import EntityId, LogEvent, LogLevel, create_entity_id
 from player_client.battlefield import Battlefield
 from character.character_class import Character
 from player_client.deck import Deck
 from player_client.hand import Hand
+from target.query_target import TargetsType
 
 if TYPE_CHECKING:
 	from game_controller import GameController
@@ -16,8 +16,14 @@ if TYPE_CHECKING:
 # Player class
 
 class Player:
+	__slots__ = (
+		"name", "game", "max_mana_crystal", "mana_crystal", "deck", "hand", "battlefield", "max_hand",
+		"fatigue", "hero",
+	)
+
 	def __init__(self, name: str, deck: Deck):
 		self.name = name
+		self.game: "GameController" = None
 		self.max_mana_crystal = 0
 		self.mana_crystal = 0
 		self.deck = deck
@@ -30,8 +36,6 @@ class Player:
 		self.hero = Character(self)
 		self.hero.set_as_hero(30)
 
-		self.game: "GameController" = None
-
 	# Set up functions
 
 	def set_game(self, game: "GameController"):
@@ -40,169 +44,185 @@ class Player:
 	# Mana functions
 
 	def set_max_mana_crystal(self, max_mana_crystal):
+		self.record_change(self)
 		self.max_mana_crystal = max_mana_crystal
 
 	def reset_mana(self):
+		self.record_change(self)
 		self.mana_crystal = self.max_mana_crystal
 
 	# Deck functions
 
 	def draw_card(self, print_result=False):
 		# Check for fatigue
-		if not self.deck.cards:
+		if not self.deck.get_card_count():
 			# Save logs
-			self.game.save_log(
-				f"<{self.name}>"
-				f" is experiencing fatigue."
-			)
+			if self.game.log_level >= LogLevel.full:
+				self.game.save_log(LogEvent.fatigue, self.name)
 
 			# Calculate fatigue
+			self.record_change(self)
 			self.fatigue += 1
 
 			# Receive fatigue
 			self.hero.receive_damage(self.fatigue)
-			print("{Fatigue}")
-			print(f"Out of cards!")
-			print(f"\t<{self.name}> take {self.fatigue} damage.")
+			if self.game.output.is_enabled:
+				self.game.output.write("{Fatigue}")
+				self.game.output.write("Out of cards!")
+				self.game.output.write(f"\t<{self.name}> take {self.fatigue} damage.")
 			return
 
 		# Overdraw
 		if len(self.hand.cards) >= self.max_hand:
-			card = self.deck.remove_top_card()
-			print(f"{{Overdrawn}} Card: {card}")
+			self.record_change(self.deck)
+			card_instance = self.deck.remove_top_card()
+			card = get_instance_card(card_instance)
+			if self.game.output.is_enabled:
+				self.game.output.write(f"{{Overdrawn}} Card: {card}")
 
 			# Save logs
-			self.game.save_log(
-				f"<{self.name}>"
-				f" overdrew card [{card.name}]."
-			)
+			if self.game.log_level >= LogLevel.full:
+				self.game.save_log(LogEvent.overdraw, self.name, self.get_entity_id(card_instance))
 			return
 
 		# Draw card
-		card = self.deck.draw_card()
-		self.hand.add_card(card)
+		self.record_change(self.hand, self.deck)
+		card_instance = self.deck.draw_card()
+		self.hand.add_card(card_instance)
+		card = get_instance_card(card_instance)
 
 		# Save logs
-		self.game.save_log(
-			f"<{self.name}>"
-			f" drew the card [{card.name}]."
-		)
+		if self.game.log_level >= LogLevel.full:
+			self.game.save_log(LogEvent.draw, self.name, self.get_entity_id(card_instance))
 
 		# Optionally prints result
-		if print_result:
-			print(f"Drawn card: {card}")
+		if print_result and self.game.output.is_enabled:
+			self.game.output.write(f"Drawn card: {card}")
 		return card
 
 	# Hand functions
 
-	def discard_card(self, card: Card):
+	def discard_card(self, card_instance: CardInstance):
+		card = get_instance_card(card_instance)
+
 		# Save logs
-		self.game.save_log(
-			f"<{self.name}>"
-			f" discarded [{card.name}]."
-		)
+		if self.game.log_level >= LogLevel.full:
+			self.game.save_log(LogEvent.discard, self.name, self.get_entity_id(card_instance))
 
 		# Remove card
-		self.remove_card(card)
-		print(f"Discarded card: [{card.name}]")
+		self.remove_card(card_instance)
+		if self.game.output.is_enabled:
+			self.game.output.write(f"Discarded card: [{card.name}]")
 
 		# TODO: Discard effect
 		pass
 
-	def remove_card(self, card: Card):
-		# Remove a card object from player's hand
-		if card in self.hand.cards:
-			self.hand.remove_card(card)
+	def remove_card(self, card_instance: CardInstance):
+		# Remove a card instance from player's hand
+		if card_instance in self.hand.cards:
+			self.record_change(self.hand)
+			self.hand.remove_card(card_instance)
 
-	def __play_and_remove_card(self, card: Card):
+	def __play_and_remove_card(self, card_index: int):
 		# Decrease mana crystal
-		self.mana_crystal -= card.mana_cost
+		self.record_change(self)
+		self.mana_crystal -= self.hand.get_card(card_index).mana_cost
 
 		# Remove card from hand
-		self.remove_card(card)
+		self.record_change(self.hand)
+		self.hand.pop_card(card_index)
 
-	def can_play_card(self, card: Card):
-		in_hand = card in self.hand.cards
-		has_enough_mana = card.mana_cost <= self.mana_crystal
-		return in_hand and has_enough_mana
+	def can_play_card(self, card_index: int):
+		if not self.hand.has_card_index(card_index):
+			return False
+		return self.hand.get_card(card_index).mana_cost <= self.mana_crystal
 
-	def play_minion_card(self, card: MinionCard, position: int):
+	def play_minion_card(self, card_index: int, position: int):
 		# Check card playable
-		if not self.can_play_card(card):
+		if not self.can_play_card(card_index):
 			return
+		card = self.hand.get_card(card_index)
+		entity_id = self.get_entity_id(self.hand.cards[card_index])
 
 		# Save logs
-		self.game.save_log(
-			f"(PLAY)"
-			f" <{self.name}>"
-			f" played [{card.name}] minion"
-			f" at battlefield position {position}."
-		)
+		if self.game.log_level >= LogLevel.game:
+			self.game.save_log(LogEvent.play_minion, self.name, entity_id, position)
 
 		# Play card
-		self.battlefield.add_minion_at(card, position)
-		self.__play_and_remove_card(card)
+		self.battlefield.add_minion_at(card, position, entity_id)
+		self.__play_and_remove_card(card_index)
 		card.play()
 
 		# Save logs
-		self.game.save_log(f"[{card.name}] minion finish played.")
+		if self.game.log_level >= LogLevel.full:
+			self.game.save_log(LogEvent.minion_played, entity_id)
 
 		# Return success
 		return True
 
-	def play_spell_card(self, card: SpellCard):
+	def play_spell_card(self, card_index: int, targets_list: list[TargetsType]):
 		# Check card playable
-		if not self.can_play_card(card):
+		if not self.can_play_card(card_index):
 			return
-
-		# Get targets list
-		targets_list = card.get_targets_list(self.game)
-		if not targets_list:
-			return
-
-		# Spell card confirmation
-		while True:
-			spell_card_confirmation_input = input("Do you want to play the spell card? (y/n): ")
-			if spell_card_confirmation_input in ("y", "n"):
-				break
-		if spell_card_confirmation_input == "n":
-			return False
+		card = self.hand.get_card(card_index)
+		entity_id = self.get_entity_id(self.hand.cards[card_index])
 
 		# Save logs
-		self.game.save_log(
-			f"(PLAY)"
-			f" <{self.name}>"
-			f" played [{card.name}] spell."
-		)
+		if self.game.log_level >= LogLevel.game:
+			self.game.save_log(LogEvent.play_spell, self.name, entity_id)
 
-		# Play card
-		print()
-		self.__play_and_remove_card(card)
-		card.play(targets_list)
+		# Play card, logging it as the source of its spells' effects
+		self.__play_and_remove_card(card_index)
+		previous_log_source = self.game.log_source
+		self.game.log_source = entity_id
+		card.play(targets_list, self.game)
+		self.game.log_source = previous_log_source
 
 		# Save logs
-		self.game.save_log(f"[{card.name}] spell finish played.")
+		if self.game.log_level >= LogLevel.full:
+			self.game.save_log(LogEvent.spell_played, entity_id)
 
 		# Return success
 		return True
 
+	# Log functions
+
+	def get_entity_id(self, card_instance: CardInstance) -> EntityId:
+		return create_entity_id(self.game.players.index(self), card_instance)
+
 	# Hero functions
 
 	def get_health(self):
 		return self.hero.health
 
 	def set_health(self, health: int):
-		self.hero.health = health
+		self.hero.set_health(health)
 
 	def concede(self):
 		# Save logs
-		self.game.save_log(
-			f"<{self.name}>"
-			f" conceded."
-		)
+		if self.game.log_level >= LogLevel.game:
+			self.game.save_log(LogEvent.concede, self.name)
 
 		self.set_health(0)
 
+	# State functions
+
+	def record_change(self, *changed_objects):
+		# Report a change of the player, hand or deck before it happens, when the game tracks changes
+		if self.game is not None and self.game.is_tracking_changes:
+			for changed_object in changed_objects:
+				self.game.record_change(changed_object)
+
+	def get_state_objects(self):
+		# Player, hand & deck states hold their own fields only, so each can be journaled separately
+		return (self, self.hand, self.deck, self.hero, *self.battlefield.characters)
+
+	def get_state(self):
+		return self.max_mana_crystal, self.mana_crystal, self.fatigue
+
+	def set_state(self, state: tuple):
+		self.max_mana_crystal, self.mana_crystal, self.fatigue = state
+
 	# Display functions
 
 	def display_hand(self, is_detailed=False):
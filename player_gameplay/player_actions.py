@@ -3,14 +3,14 @@
 from aesthetics import horizontal_rule
 from cards.card_minion import MinionCard
 from cards.card_spell import SpellCard
-from game_controller import GameController
-from player_gameplay.player_input import input_card_choice, input_empty_battlefield_position, input_minion_battlefield_position
+from game_controller import GameController, attack_query_target
+from player_gameplay.player_input import input_card_choice, input_empty_battlefield_position, \
+	input_minion_battlefield_position, input_spell_confirmation
 from target.target_get import get_targets_input
-from target.query_target import QueryTarget, TargetAlliance, TargetCharacterType, TargetChooseMethod
 
 # Variables
 
-action_list = [
+action_list = (
 	"h",
 	"field", "fd",
 	"hand", "hd",
@@ -18,13 +18,6 @@ action_list = [
 	"attack", "atk",
 	"hero power",
 	"e", "end", "concede",
-]
-
-attack_query_target = QueryTarget(
-	TargetAlliance.enemy, TargetCharacterType.any_character,
-	(1, 1), TargetChooseMethod.user_input,
-	respect_taunt=True,
-	respect_stealth=True
 )
 
 # Functions
@@ -67,10 +60,10 @@ def process_action(action: str, game: GameController):
 				return
 
 			# Get card
-			card = player.hand.cards[card_choice]
+			card = player.hand.get_card(card_choice)
 
 			# Check if card can be played
-			if not player.can_play_card(card):
+			if not player.can_play_card(card_choice):
 				print("Can't play card!")
 				return True
 
@@ -94,8 +87,18 @@ def process_action(action: str, game: GameController):
 					print(f"Played [{card.name}] minion at battlefield position {position}.")
 
 			elif isinstance(card, SpellCard):
+				# Input targets for each spell
+				targets_list = card.get_targets_list(game)
+				if not targets_list:
+					return True
+
+				# Spell card confirmation
+				if not input_spell_confirmation():
+					return True
+
 				# Play card
-				success = game.turn_play_spell_card(card_choice)
+				print()
+				success = game.turn_play_spell_card(card_choice, targets_list)
 
 				# Print success
 				if success:
@@ -132,7 +135,10 @@ def process_action(action: str, game: GameController):
 
 			# Attack
 			target = targets[0]
-			game.attack(minion, target)
+			result = game.attack(game.get_character_id(minion), game.get_character_id(target))
+			if not result:
+				print(result.message)
+				return True
 
 			# Print message
 			print(f"[{minion.name}] attacks {target.commander.name}'s [{target.name}].")
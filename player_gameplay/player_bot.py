@@ -0,0 +1,123 @@
+"""Chooses actions for computer-controlled players"""
+
+import random
+
+from cards.card_minion import MinionCard
+from cards.card_spell import SpellCard
+from character.character_class import CharacterType
+from game_actions import Action, ActionType
+from game_controller import GameController, attack_query_target, attacker_can_attack
+from game_loop import Decision, DecisionType
+from spells.spell_module import Spell
+from target.query_target import TargetChooseMethod
+from target.target_get import get_available_targets
+
+# Functions
+
+def choose_targets(spell: Spell, game: GameController, rng: random.Random):
+	player = game.turn_get_player()
+
+	# Prefer enemy targets
+	available_targets = get_available_targets(spell.query_target, game)
+	enemy_targets = [target for target in available_targets if target.commander != player]
+	if enemy_targets:
+		available_targets = enemy_targets
+
+	# Validate target count
+	target_count = spell.query_target.count_range[1]
+	if target_count == -1:
+		target_count = len(available_targets)
+	target_count = min(target_count, len(available_targets))
+	if not spell.query_target.check_count(target_count):
+		return
+
+	# Choose random targets
+	targets = rng.sample(available_targets, target_count)
+	return [game.get_character_id(target) for target in targets]
+
+def choose_spell_targets(card: SpellCard, game: GameController, rng: random.Random):
+	# Choose targets for each user input spell
+	targets_list = []
+	for spell in card.spells:
+		if spell.query_target.choose_method != TargetChooseMethod.user_input:
+			targets_list.append([])
+			continue
+
+		targets = choose_targets(spell, game, rng)
+		if targets is None:
+			return
+		targets_list.append(targets)
+
+	# Return targets ids for each spell
+	return targets_list
+
+def get_possible_actions(game: GameController, rng: random.Random):
+	player = game.turn_get_player()
+	player_index = game.players.index(player)
+	actions = []
+
+	# Play cards
+	empty_positions = [
+		position for position in range(len(player.battlefield.characters))
+		if player.battlefield.characters[position].character_type == CharacterType.none
+	]
+	for card_index in range(len(player.hand.cards)):
+		card = player.hand.get_card(card_index)
+		if not player.can_play_card(card_index):
+			continue
+
+		if isinstance(card, MinionCard) and empty_positions:
+			actions.append(Action(ActionType.play_minion, card_index, rng.choice(empty_positions)))
+		elif isinstance(card, SpellCard):
+			targets_list = choose_spell_targets(card, game, rng)
+			if targets_list is not None:
+				actions.append(Action(ActionType.play_spell, card_index, targets_list))
+
+	# Attack
+	for position in range(len(player.battlefield.characters)):
+		attacker = player.battlefield.characters[position]
+		if attacker.character_type != CharacterType.minion or not attacker_can_attack(attacker):
+			continue
+
+		targets = get_available_targets(attack_query_target, game, attacker)
+		if targets:
+			target_id = game.get_character_id(rng.choice(targets))
+			actions.append(Action(ActionType.attack, (player_index, position), target_id))
+
+	return actions
+
+def choose_action(game: GameController, rng: random.Random):
+	# Choose a random possible action, or end the turn
+	actions = get_possible_actions(game, rng)
+	if not actions:
+		return Action(ActionType.end_turn)
+	return rng.choice(actions)
+
+def play_bot_turn(game: GameController, rng: random.Random):
+	# Perform actions until the bot ends its turn
+	while not game.is_game_ended():
+		action = choose_action(game, rng)
+		if action.action_type == ActionType.end_turn:
+			break
+
+		# Stop on failed actions to avoid repeating them
+		result = game.perform_action(action)
+		if not result:
+			break
+
+	# End turn
+	game.end_turn()
+
+def answer_decision(decision: Decision, rng: random.Random):
+	# Answer a decision from a stepped game loop
+	match decision.decision_type:
+		case DecisionType.choose_action:
+			# End turn on failed actions to avoid repeating them
+			if decision.last_result is not None and not decision.last_result:
+				return Action(ActionType.end_turn)
+			return choose_action(decision.game, rng)
+		case DecisionType.choose_targets:
+			targets = choose_targets(decision.subject, decision.game, rng)
+			return targets if targets is not None else []
+		case DecisionType.confirm_spell:
+			return True
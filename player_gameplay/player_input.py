@@ -73,6 +73,13 @@ def input_minion_battlefield_position(player: Player):
 	# Return choice
 	return position
 
+def input_spell_confirmation():
+	while True:
+		spell_card_confirmation_input = input("Do you want to play the spell card? (y/n): ")
+		if spell_card_confirmation_input in ("y", "n"):
+			break
+	return spell_card_confirmation_input == "y"
+
 def input_character_type():
 	while True:
 		print("'m' for minions")
@@ -0,0 +1,180 @@
+"""Runs bot-vs-bot games in parallel for batch simulations"""
+
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cards.card_base import Card
+from cards.card_storage import minion_cards, spell_cards
+from game_controller import GameController
+from game_log import LogLevel
+from game_loop import Decision, default_deck_cards, run_stepped_games
+from output_sink import NullSink
+from player_client.deck import Deck
+from player_client.player import Player
+from player_gameplay.player_bot import answer_decision, play_bot_turn
+
+# Types
+
+type GameResult = dict[str, object]
+
+# Helper functions
+
+def get_card_names(cards: list[Card]):
+	return [card.name for card in cards]
+
+def get_cards(card_names: list[str]):
+	all_cards = minion_cards | spell_cards
+	return [all_cards[card_name] for card_name in card_names]
+
+def create_bot_game(deck_card_names: list[str], player_count=2, seed: int = None, log_level=LogLevel.full):
+	# Create bot players
+	deck_cards = get_cards(deck_card_names)
+	players = [Player(f"Bot {i + 1}", Deck(deck_cards)) for i in range(player_count)]
+
+	# Create game without terminal output
+	return GameController(players, NullSink(), seed, log_level)
+
+def create_bot_rng(game: GameController):
+	# Bot decisions use their own stream, so game randomness only depends on the game seed
+	return random.Random(f"bot-{game.seed}")
+
+def play_bot_game(game: GameController):
+	bot_rng = create_bot_rng(game)
+
+	# Start game
+	game.start_game()
+
+	# Game loop phase
+	while not game.is_game_ended():
+		game.begin_turn()
+		play_bot_turn(game, bot_rng)
+
+	# End game
+	game.end_game()
+	return game
+
+def play_stepped_bot_games(games: list[GameController]):
+	bot_rngs = {game: create_bot_rng(game) for game in games}
+
+	# Answer all pending bot decisions in one batch
+	def decide_batch(decisions: list[Decision]):
+		return [answer_decision(decision, bot_rngs[decision.game]) for decision in decisions]
+
+	# Step all games side by side on this thread
+	return run_stepped_games(games, decide_batch)
+
+def check_thread_isolation(game_count: int, thread_count: int, deck_cards: list[Card] = None, seed=0):
+	# Games only share immutable card data, so threaded games must match sequential games
+	if deck_cards is None:
+		deck_cards = default_deck_cards
+	deck_card_names = get_card_names(deck_cards)
+	seeds = [seed + game_index for game_index in range(game_count)]
+
+	# Play games on a thread pool
+	def play_threaded_game(game_seed: int):
+		return play_bot_game(create_bot_game(deck_card_names, seed=game_seed)).game_logs
+	with ThreadPoolExecutor(thread_count) as executor:
+		threaded_game_logs = list(executor.map(play_threaded_game, seeds))
+
+	# Compare with games played one by one
+	for game_seed, game_logs in zip(seeds, threaded_game_logs):
+		if play_bot_game(create_bot_game(deck_card_names, seed=game_seed)).game_logs != game_logs:
+			return False
+	return True
+
+# Worker functions
+
+def run_bot_game(task: tuple[int, int, list[str], int]) -> GameResult:
+	game_index, seed, deck_card_names, player_count = task
+	start_time = time.perf_counter()
+
+	# Play game without logs
+	game = create_bot_game(deck_card_names, player_count, seed, LogLevel.off)
+	play_bot_game(game)
+
+	# Return game result
+	return {
+		"game_index": game_index,
+		"seed": seed,
+		"winner": game.get_winner(),
+		"rounds": game.round_number,
+		"health": {player.name: player.get_health() for player in game.players},
+		"worker": os.getpid(),
+		"busy_time": time.perf_counter() - start_time,
+	}
+
+# Simulation functions
+
+def iter_simulation_results(
+		game_count: int,
+		deck_cards: list[Card] = None,
+		player_count=2,
+		worker_count: int = None,
+		seed=0,
+		chunk_size=16,
+):
+	# Use default deck
+	if deck_cards is None:
+		deck_cards = default_deck_cards
+	deck_card_names = get_card_names(deck_cards)
+
+	# Stream results from the process pool, seeding each game by its index
+	tasks = (
+		(game_index, seed + game_index, deck_card_names, player_count)
+		for game_index in range(game_count)
+	)
+	with multiprocessing.Pool(worker_count) as pool:
+		for result in pool.imap_unordered(run_bot_game, tasks, chunk_size):
+			yield result
+
+def simulate(
+		game_count: int,
+		deck_cards: list[Card] = None,
+		player_count=2,
+		worker_count: int = None,
+		seed=0,
+		on_result=None,
+):
+	if worker_count is None:
+		worker_count = os.cpu_count()
+
+	# Run games
+	start_time = time.perf_counter()
+	wins: dict[str | None, int] = {}
+	worker_busy_times: dict[int, float] = {}
+	total_rounds = 0
+	for result in iter_simulation_results(game_count, deck_cards, player_count, worker_count, seed):
+		# Stream result
+		if on_result:
+			on_result(result)
+
+		# Aggregate result
+		wins[result["winner"]] = wins.get(result["winner"], 0) + 1
+		worker_busy_times[result["worker"]] = worker_busy_times.get(result["worker"], 0) + result["busy_time"]
+		total_rounds += result["rounds"]
+	elapsed_time = time.perf_counter() - start_time
+
+	# Report
+	print(f"{" Simulation ":-^50}")
+	print(f"Games: {game_count} | Workers: {worker_count} | Time: {elapsed_time:.2f}s")
+	print(f"Games/sec: {game_count / elapsed_time:.1f}")
+	print(f"Average rounds: {total_rounds / max(1, game_count):.1f}")
+	print("Wins:")
+	for winner, win_count in sorted(wins.items(), key=lambda item: -item[1]):
+		print(f"\t{f"<{winner}>" if winner else "(tie)":12} {win_count}")
+	print("Worker utilization:")
+	for worker, busy_time in sorted(worker_busy_times.items()):
+		print(f"\t{worker:<8} {busy_time / elapsed_time:6.1%}")
+
+	return {
+		"games": game_count,
+		"elapsed_time": elapsed_time,
+		"games_per_second": game_count / elapsed_time,
+		"wins": wins,
+		"worker_utilization": {
+			worker: busy_time / elapsed_time for worker, busy_time in worker_busy_times.items()
+		},
+	}
@@ -12,6 +12,8 @@ if TYPE_CHECKING:
 # Class
 
 class Spell:
+	__slots__ = ("description", "spell_effect", "query_target")
+
 	def __init__(self, description: str, spell_effect: EffectFunction, query_target: QueryTarget):
 		self.description = description
 		self.spell_effect = spell_effect
@@ -24,6 +26,19 @@ class Spell:
 		# Return targets
 		return targets
 
+	def check_targets_valid(self, game: "GameController", targets: TargetsType):
+		# Validate each target like a user input selection
+		selected_targets = []
+		for target in targets:
+			try:
+				self.query_target.check_character_valid(game.turn_get_player().hero, target)
+			except Exception:
+				return False
+			if not self.query_target.can_add_target(selected_targets, target):
+				return False
+			selected_targets.append(target)
+		return True
+
 	def can_cast_spell(self, targets: TargetsType):
 		is_target_len_valid = self.query_target.check_count(len(targets))
 		return is_target_len_valid
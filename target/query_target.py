@@ -3,8 +3,7 @@
 from enum import Enum
 from typing import TYPE_CHECKING
 
-from character.character_class import Character, CharacterType
-from character.character_effect_types import CharacterEffectType
+from character.character_class import Character, CharacterType, stealth_keyword
 
 if TYPE_CHECKING:
 	from player_client.player import Player
@@ -35,6 +34,11 @@ class TargetChooseMethod(Enum):
 # Query target class
 
 class QueryTarget:
+	__slots__ = (
+		"alliance", "targeted_character_type", "count_range", "choose_method", "exclude_self",
+		"only_self", "respect_taunt", "respect_stealth",
+	)
+
 	def __init__(
 			self,
 			alliance: TargetAlliance,
@@ -101,7 +105,7 @@ class QueryTarget:
 	def __check_character_not_stealth(self, target: Character):
 		if not self.respect_stealth:
 			return True
-		return not CharacterEffectType.stealth in target.active_effect_types
+		return not target.active_keywords & stealth_keyword
 
 	def check_character_valid(self, source: Character, target: Character):
 		if target.health <= 0:
@@ -1,6 +1,5 @@
 """Contains functions for selecting characters based on criteria"""
 
-import random
 from typing import TYPE_CHECKING
 
 from character.character_class import Character
@@ -18,6 +17,10 @@ def get_available_targets(
 		game: "GameController",
 		pov_character: Character = None,
 ) -> TargetsType:
+	# Count call
+	if game.instrumentation is not None:
+		game.instrumentation.count("get_available_targets")
+
 	# Find all targets in the game
 	raw_targets = []
 	for player in game.players:
@@ -117,7 +120,7 @@ def get_targets_random(query_target: QueryTarget, game: "GameController") -> Tar
 
 	# Choose a random number of targets
 	sample_size = min(len(available_targets), query_target.count_range[1])
-	targets = random.sample(available_targets, sample_size)
+	targets = game.rng.sample(available_targets, sample_size)
 
 	# Return targets
 	return targets